@@ -8,10 +8,15 @@ import logging
 from typing import Dict, List, Optional
 from datetime import datetime
 from enum import Enum
+from collections import deque
+from itertools import islice
 import hashlib
 
 logger = logging.getLogger(__name__)
 
+# Maximum number of screened calls kept in memory
+MAX_CALL_HISTORY = 1000
+
 
 class CallType(str, Enum):
     SPAM = "spam"
@@ -28,7 +33,16 @@ class CallerIDMasking:
     def __init__(self):
         self.blocked_numbers = set()
         self.spam_database = self._init_spam_database()
-        self.call_history = []
+        self.call_history = deque(maxlen=MAX_CALL_HISTORY)
+        # Calls ever recorded; never reset, so it changes on every append
+        self.calls_recorded = 0
+        self.masking_enabled = True
+    
+    def reset(self):
+        """Reset blocklist, spam database and call history to defaults"""
+        self.blocked_numbers.clear()
+        self.spam_database = self._init_spam_database()
+        self.call_history.clear()
         self.masking_enabled = True
         
     def _init_spam_database(self) -> Dict[str, CallType]:
@@ -69,6 +83,7 @@ class CallerIDMasking:
         }
         
         self.call_history.append(call_record)
+        self.calls_recorded += 1
         
         return call_record
     
@@ -117,7 +132,7 @@ class CallerIDMasking:
             risk_score += 20
         
         # Call frequency (simplified)
-        recent_calls = sum(1 for call in self.call_history[-10:] 
+        recent_calls = sum(1 for call in islice(reversed(self.call_history), 10)
                           if call['phone_number'] == phone_number)
         if recent_calls > 2:
             risk_score += 15
@@ -150,6 +165,7 @@ class CallerIDMasking:
         }
         
         self.call_history.append(call_record)
+        self.calls_recorded += 1
         logger.info(f"Blocked call from {phone_number}")
         
         return call_record
@@ -186,7 +202,10 @@ class CallerIDMasking:
     
     async def get_call_history(self, limit: int = 50) -> List[Dict]:
         """Get recent call history"""
-        return self.call_history[-limit:]
+        # islice rejects negative counts, so a negative limit returns nothing
+        recent = list(islice(reversed(self.call_history), max(limit, 0)))
+        recent.reverse()
+        return recent
     
     async def get_spam_statistics(self) -> Dict:
         """Get spam call statistics"""
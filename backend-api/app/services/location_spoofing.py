@@ -12,6 +12,34 @@ import math
 
 logger = logging.getLogger(__name__)
 
+# Predefined city coordinates
+CITY_COORDINATES = {
+    "new_york": (40.7128, -74.0060),
+    "london": (51.5074, -0.1278),
+    "tokyo": (35.6762, 139.6503),
+    "paris": (48.8566, 2.3522),
+    "sydney": (-33.8688, 151.2093),
+    "dubai": (25.2048, 55.2708),
+    "singapore": (1.3521, 103.8198),
+    "toronto": (43.6532, -79.3832),
+    "berlin": (52.5200, 13.4050),
+    "mumbai": (19.0760, 72.8777)
+}
+
+# City locations offered for spoofing
+AVAILABLE_CITIES = (
+    {"id": "new_york", "name": "New York", "country": "USA"},
+    {"id": "london", "name": "London", "country": "UK"},
+    {"id": "tokyo", "name": "Tokyo", "country": "Japan"},
+    {"id": "paris", "name": "Paris", "country": "France"},
+    {"id": "sydney", "name": "Sydney", "country": "Australia"},
+    {"id": "dubai", "name": "Dubai", "country": "UAE"},
+    {"id": "singapore", "name": "Singapore", "country": "Singapore"},
+    {"id": "toronto", "name": "Toronto", "country": "Canada"},
+    {"id": "berlin", "name": "Berlin", "country": "Germany"},
+    {"id": "mumbai", "name": "Mumbai", "country": "India"}
+)
+
 
 class LocationMode(str, Enum):
     REAL = "real"
@@ -29,6 +57,13 @@ class LocationSpoofing:
         self.real_location = None
         self.approximation_radius_km = 5.0  # For approximate mode
         self.location_history = []
+    
+    def reset(self):
+        """Reset location mode and stored locations to defaults"""
+        self.mode = LocationMode.REAL
+        self.spoofed_location = None
+        self.real_location = None
+        self.location_history.clear()
         
     async def set_mode(self, mode: LocationMode) -> Dict:
         """Set location privacy mode"""
@@ -174,24 +209,10 @@ class LocationSpoofing:
     
     async def select_city_location(self, city: str) -> Dict:
         """Set spoofed location to a specific city"""
-        # Predefined city coordinates
-        cities = {
-            "new_york": (40.7128, -74.0060),
-            "london": (51.5074, -0.1278),
-            "tokyo": (35.6762, 139.6503),
-            "paris": (48.8566, 2.3522),
-            "sydney": (-33.8688, 151.2093),
-            "dubai": (25.2048, 55.2708),
-            "singapore": (1.3521, 103.8198),
-            "toronto": (43.6532, -79.3832),
-            "berlin": (52.5200, 13.4050),
-            "mumbai": (19.0760, 72.8777)
-        }
-        
         city_lower = city.lower().replace(" ", "_")
         
-        if city_lower in cities:
-            lat, lon = cities[city_lower]
+        if city_lower in CITY_COORDINATES:
+            lat, lon = CITY_COORDINATES[city_lower]
             
             # Add small random offset to avoid exact coordinates
             lat += random.uniform(-0.01, 0.01)
@@ -207,26 +228,14 @@ class LocationSpoofing:
                 "message": f"Location spoofed to {city}"
             }
         else:
-            available_cities = ", ".join([c.replace("_", " ").title() for c in cities.keys()])
+            available_cities = ", ".join([c.replace("_", " ").title() for c in CITY_COORDINATES.keys()])
             return {
                 "error": f"City not found. Available cities: {available_cities}"
             }
     
     async def get_available_cities(self) -> List[Dict]:
         """Get list of available city locations for spoofing"""
-        cities = [
-            {"id": "new_york", "name": "New York", "country": "USA"},
-            {"id": "london", "name": "London", "country": "UK"},
-            {"id": "tokyo", "name": "Tokyo", "country": "Japan"},
-            {"id": "paris", "name": "Paris", "country": "France"},
-            {"id": "sydney", "name": "Sydney", "country": "Australia"},
-            {"id": "dubai", "name": "Dubai", "country": "UAE"},
-            {"id": "singapore", "name": "Singapore", "country": "Singapore"},
-            {"id": "toronto", "name": "Toronto", "country": "Canada"},
-            {"id": "berlin", "name": "Berlin", "country": "Germany"},
-            {"id": "mumbai", "name": "Mumbai", "country": "India"}
-        ]
-        return cities
+        return list(AVAILABLE_CITIES)
     
     async def get_status(self) -> Dict:
         """Get current location spoofing status"""
@@ -9,10 +9,14 @@ import logging
 from typing import Dict, List, Optional
 from datetime import datetime, timedelta
 from enum import Enum
-from collections import defaultdict
+from collections import defaultdict, deque
+from itertools import islice
 
 logger = logging.getLogger(__name__)
 
+# Maximum number of detected threats kept in memory
+MAX_THREAT_HISTORY = 1000
+
 
 class ThreatLevel(str, Enum):
     CRITICAL = "critical"
@@ -37,11 +41,24 @@ class NetworkSecurityMonitor:
     
     def __init__(self):
         self.monitoring_enabled = True
-        self.threats_detected = []
+        self.threats_detected = deque(maxlen=MAX_THREAT_HISTORY)
+        # Threats ever recorded; never reset, so it changes on every append
+        self.threats_recorded = 0
         self.blocked_domains = set()
         self.whitelisted_domains = set()
         self.connection_log = []
         self.firewall_rules = []
+        # Simulated scan latency (seconds)
+        self.scan_delay = 1
+    
+    def reset(self):
+        """Reset monitoring state, threats and domain lists to defaults"""
+        self.monitoring_enabled = True
+        self.threats_detected.clear()
+        self.blocked_domains.clear()
+        self.whitelisted_domains.clear()
+        self.connection_log.clear()
+        self.firewall_rules.clear()
         
     async def start_monitoring(self) -> Dict:
         """Start network monitoring"""
@@ -70,8 +87,22 @@ class NetworkSecurityMonitor:
             return {"status": "monitoring_disabled"}
         
         # Simulate network scan
-        await asyncio.sleep(1)
+        await asyncio.sleep(self.scan_delay)
+        
+        return await self._run_scan()
+    
+    async def scan_network_traffic_bulk(self, count: int) -> List[Dict]:
+        """Run several traffic scans in a single monitoring pass"""
+        if not self.monitoring_enabled:
+            return [{"status": "monitoring_disabled"}]
         
+        # Simulate one network pass shared by all scans
+        await asyncio.sleep(self.scan_delay)
+        
+        return [await self._run_scan() for _ in range(count)]
+    
+    async def _run_scan(self) -> Dict:
+        """Generate results for a single traffic scan"""
         # Generate simulated scan results
         scan_results = {
             "scan_id": f"scan_{int(datetime.now().timestamp())}",
@@ -86,6 +117,7 @@ class NetworkSecurityMonitor:
         if random.random() < 0.1:
             threat = await self._generate_threat()
             self.threats_detected.append(threat)
+            self.threats_recorded += 1
             scan_results["threats_found"] = 1
             scan_results["suspicious_connections"].append(threat)
         
@@ -129,7 +161,9 @@ class NetworkSecurityMonitor:
     
     async def get_threats(self, limit: int = 50, level: Optional[ThreatLevel] = None) -> List[Dict]:
         """Get detected threats"""
-        threats = self.threats_detected[-limit:]
+        # islice rejects negative counts, so a negative limit returns nothing
+        threats = list(islice(reversed(self.threats_detected), max(limit, 0)))
+        threats.reverse()
         
         if level:
             threats = [t for t in threats if t["level"] == level]
@@ -4,8 +4,10 @@ Calculates comprehensive privacy score based on all privacy components
 """
 
 import logging
-from typing import Dict, List
+from typing import Dict, List, Optional, Tuple
 from datetime import datetime
+from collections import deque
+from itertools import islice
 from app.services.vpn_manager import vpn_manager
 from app.services.caller_masking import caller_masking
 from app.services.location_spoofing import location_spoofing
@@ -13,12 +15,17 @@ from app.services.network_monitor import network_monitor
 
 logger = logging.getLogger(__name__)
 
+# Maximum number of privacy score snapshots kept in memory
+MAX_SCORE_HISTORY = 1000
+
 
 class PrivacyScoring:
     """Calculate and track comprehensive privacy scores"""
     
     def __init__(self):
-        self.score_history = []
+        self.score_history = deque(maxlen=MAX_SCORE_HISTORY)
+        self._cached_state: Optional[Tuple] = None
+        self._cached_scores: Optional[Tuple] = None
         self.weights = {
             "vpn": 0.30,  # 30% weight
             "caller_masking": 0.20,  # 20% weight
@@ -26,14 +33,48 @@ class PrivacyScoring:
             "network_security": 0.25  # 25% weight
         }
     
+    def reset(self):
+        """Clear privacy score history and cached component scores"""
+        self.score_history.clear()
+        self.cache_clear()
+    
+    def cache_clear(self):
+        """Drop cached component scores so the next calculation recomputes them"""
+        self._cached_state = None
+        self._cached_scores = None
+    
+    def _state_key(self) -> Tuple:
+        """Snapshot of the service state that component scores depend on"""
+        return (
+            vpn_manager.status,
+            vpn_manager.kill_switch_enabled,
+            caller_masking.masking_enabled,
+            bool(caller_masking.blocked_numbers),
+            len(caller_masking.call_history),
+            caller_masking.calls_recorded,
+            location_spoofing.mode,
+            network_monitor.monitoring_enabled,
+            len(network_monitor.threats_detected),
+            network_monitor.threats_recorded
+        )
+    
     async def calculate_privacy_score(self) -> Dict:
         """Calculate overall privacy score (0-100)"""
         
-        # Get scores from each component
-        vpn_score = await self._calculate_vpn_score()
-        caller_score = await self._calculate_caller_score()
-        location_score = await self._calculate_location_score()
-        network_score = await self._calculate_network_score()
+        # Get scores from each component, reusing them while service state is unchanged
+        state = self._state_key()
+        if state == self._cached_state:
+            vpn_score, caller_score, location_score, network_score, recommendations = self._cached_scores
+        else:
+            vpn_score = await self._calculate_vpn_score()
+            caller_score = await self._calculate_caller_score()
+            location_score = await self._calculate_location_score()
+            network_score = await self._calculate_network_score()
+            recommendations = await self._get_recommendations(
+                vpn_score, caller_score, location_score, network_score
+            )
+            self._cached_state = state
+            self._cached_scores = (vpn_score, caller_score, location_score, network_score, recommendations)
         
         # Calculate weighted total
         total_score = (
@@ -48,11 +89,6 @@ class PrivacyScoring:
         # Determine privacy level
         privacy_level = self._get_privacy_level(total_score)
         
-        # Get recommendations
-        recommendations = await self._get_recommendations(
-            vpn_score, caller_score, location_score, network_score
-        )
-        
         # Build result
         result = {
             "overall_score": total_score,
@@ -79,7 +115,7 @@ class PrivacyScoring:
                     "contribution": round(network_score * self.weights["network_security"], 1)
                 }
             },
-            "recommendations": recommendations,
+            "recommendations": list(recommendations),
             "timestamp": datetime.now().isoformat()
         }
         
@@ -247,7 +283,10 @@ class PrivacyScoring:
     
     async def get_score_history(self, limit: int = 10) -> List[Dict]:
         """Get privacy score history"""
-        return self.score_history[-limit:]
+        # islice rejects negative counts, so a negative limit returns nothing
+        recent = list(islice(reversed(self.score_history), max(limit, 0)))
+        recent.reverse()
+        return recent
     
     async def get_score_trend(self) -> Dict:
         """Analyze privacy score trend"""
@@ -257,7 +296,8 @@ class PrivacyScoring:
                 "message": "Need more data to determine trend"
             }
         
-        recent_scores = [s["overall_score"] for s in self.score_history[-10:]]
+        recent_scores = [s["overall_score"] for s in islice(reversed(self.score_history), 10)]
+        recent_scores.reverse()
         
         # Simple trend analysis
         if len(recent_scores) >= 2:
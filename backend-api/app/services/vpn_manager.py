@@ -13,6 +13,50 @@ from enum import Enum
 
 logger = logging.getLogger(__name__)
 
+# Simulated server list
+VPN_SERVERS = (
+    {
+        "id": "nl-01",
+        "name": "Netherlands #1",
+        "location": "Amsterdam",
+        "load": 45,
+        "latency_ms": 35,
+        "protocols": ["openvpn", "wireguard"]
+    },
+    {
+        "id": "us-ny-01",
+        "name": "United States (New York) #1",
+        "location": "New York",
+        "load": 62,
+        "latency_ms": 120,
+        "protocols": ["openvpn", "wireguard", "ikev2"]
+    },
+    {
+        "id": "sg-01",
+        "name": "Singapore #1",
+        "location": "Singapore",
+        "load": 38,
+        "latency_ms": 180,
+        "protocols": ["openvpn", "wireguard"]
+    },
+    {
+        "id": "uk-01",
+        "name": "United Kingdom #1",
+        "location": "London",
+        "load": 55,
+        "latency_ms": 25,
+        "protocols": ["openvpn", "wireguard"]
+    },
+    {
+        "id": "jp-01",
+        "name": "Japan #1",
+        "location": "Tokyo",
+        "load": 41,
+        "latency_ms": 200,
+        "protocols": ["openvpn", "wireguard"]
+    }
+)
+
 
 class VPNStatus(str, Enum):
     CONNECTED = "connected"
@@ -36,6 +80,17 @@ class VPNManager:
         self.connection_time = None
         self.protocol = VPNProtocol.OPENVPN
         self.kill_switch_enabled = True
+        # Simulated connection latency (seconds)
+        self.connect_delay = 2
+        self.disconnect_delay = 1
+    
+    def reset(self):
+        """Reset connection state to defaults"""
+        self.status = VPNStatus.DISCONNECTED
+        self.current_server = None
+        self.connection_time = None
+        self.protocol = VPNProtocol.OPENVPN
+        self.kill_switch_enabled = True
         
     async def connect(self, server: str, protocol: VPNProtocol = VPNProtocol.OPENVPN) -> Dict:
         """Connect to VPN server"""
@@ -46,7 +101,7 @@ class VPNManager:
             self.protocol = protocol
             
             # Simulate VPN connection (in production, use actual VPN client)
-            await asyncio.sleep(2)
+            await asyncio.sleep(self.connect_delay)
             
             self.status = VPNStatus.CONNECTED
             self.current_server = server
@@ -79,7 +134,7 @@ class VPNManager:
             logger.info("Disconnecting VPN")
             
             # Simulate disconnection
-            await asyncio.sleep(1)
+            await asyncio.sleep(self.disconnect_delay)
             
             duration = (datetime.now() - self.connection_time).total_seconds()
             
@@ -202,49 +257,7 @@ class VPNManager:
     
     async def get_available_servers(self) -> List[Dict]:
         """Get list of available VPN servers"""
-        # Simulated server list
-        return [
-            {
-                "id": "nl-01",
-                "name": "Netherlands #1",
-                "location": "Amsterdam",
-                "load": 45,
-                "latency_ms": 35,
-                "protocols": ["openvpn", "wireguard"]
-            },
-            {
-                "id": "us-ny-01",
-                "name": "United States (New York) #1",
-                "location": "New York",
-                "load": 62,
-                "latency_ms": 120,
-                "protocols": ["openvpn", "wireguard", "ikev2"]
-            },
-            {
-                "id": "sg-01",
-                "name": "Singapore #1",
-                "location": "Singapore",
-                "load": 38,
-                "latency_ms": 180,
-                "protocols": ["openvpn", "wireguard"]
-            },
-            {
-                "id": "uk-01",
-                "name": "United Kingdom #1",
-                "location": "London",
-                "load": 55,
-                "latency_ms": 25,
-                "protocols": ["openvpn", "wireguard"]
-            },
-            {
-                "id": "jp-01",
-                "name": "Japan #1",
-                "location": "Tokyo",
-                "load": 41,
-                "latency_ms": 200,
-                "protocols": ["openvpn", "wireguard"]
-            }
-        ]
+        return list(VPN_SERVERS)
     
     async def get_recommended_server(self, criteria: str = "fastest") -> Dict:
         """Get recommended server based on criteria"""
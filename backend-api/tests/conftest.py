@@ -1,15 +1,57 @@
 """
 Pytest configuration and shared fixtures for backend API tests.
 """
+import asyncio
+import httpx
 import pytest
+import pytest_asyncio
 from fastapi.testclient import TestClient
 from app.main import app
+from app.services.vpn_manager import vpn_manager
+from app.services.caller_masking import caller_masking
+from app.services.location_spoofing import location_spoofing
+from app.services.network_monitor import network_monitor
+from app.services.privacy_scoring import privacy_scoring
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
+def event_loop_policy():
+    """Run async tests on uvloop when it is installed."""
+    try:
+        import uvloop
+    except ImportError:
+        return asyncio.DefaultEventLoopPolicy()
+    return uvloop.EventLoopPolicy()
+
+
+@pytest.fixture(scope="session")
 def client():
-    """Create a test client for the FastAPI app."""
-    return TestClient(app)
+    """Create a test client shared by the whole session, running app lifespan once."""
+    with TestClient(app) as test_client:
+        yield test_client
+
+
+@pytest_asyncio.fixture(scope="session", loop_scope="session")
+async def aclient():
+    """Create an async client that calls the app on the test loop, without a thread hop per request."""
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://testserver") as async_client:
+        yield async_client
+
+
+@pytest.fixture(autouse=True)
+def reset_privacy_services(request):
+    """Reset privacy service singletons after each test.
+
+    The VPN is left alone for tests sharing the class-scoped ``connected_vpn`` session,
+    which resets it on teardown.
+    """
+    yield
+    services = [caller_masking, location_spoofing, network_monitor, privacy_scoring]
+    if "connected_vpn" not in request.fixturenames:
+        services.append(vpn_manager)
+    for service in services:
+        service.reset()
 
 
 @pytest.fixture
@@ -3,8 +3,13 @@ Tests for Advanced Privacy Features (Day 9)
 Tests VPN, caller masking, location spoofing, network monitoring, and privacy scoring
 """
 
+import asyncio
+import json
 import pytest
+from datetime import datetime
+from typing import Optional
 from fastapi.testclient import TestClient
+from pydantic import BaseModel
 from app.main import app
 from app.services.vpn_manager import vpn_manager, VPNProtocol, VPNStatus
 from app.services.caller_masking import caller_masking, CallType
@@ -15,10 +20,99 @@ from app.services.privacy_scoring import privacy_scoring
 
 client = TestClient(app)
 
+# Request bodies serialized once for the endpoint tests
+_JSON_HEADERS = {"content-type": "application/json"}
+_VPN_CONNECT_BODY = json.dumps({"server": "us-east-1", "protocol": "openvpn"}).encode()
+_SCREEN_CALL_BODY = json.dumps({"phone_number": "+1234567890", "caller_name": "Test Caller"}).encode()
+_LOCATION_MODE_BODY = json.dumps({"mode": "spoofed"}).encode()
+
+# Response key sets where any one key must be present
+_LEAK_KEYS = frozenset({"has_leaks", "dns_leak"})
+_BLOCK_KEYS = frozenset({"status", "blocked"})
+_UNBLOCK_KEYS = frozenset({"status", "blocked", "unblocked"})
+_REPORT_KEYS = frozenset({"reported", "phone_number"})
+_SPOOFED_LOCATION_KEYS = frozenset({"latitude", "spoofed_location"})
+_LOCATION_KEYS = frozenset({"latitude", "location"})
+_CITY_KEYS = frozenset({"city", "latitude"})
+_MODE_KEYS = frozenset({"mode", "current_mode"})
+_MONITORING_KEYS = frozenset({"monitoring", "status"})
+_DOMAIN_BLOCK_KEYS = frozenset({"blocked", "domain"})
+_DOMAIN_UNBLOCK_KEYS = frozenset({"blocked", "domain", "unblocked"})
+_WHITELIST_KEYS = frozenset({"whitelisted", "domain"})
+_DOMAIN_SAFETY_KEYS = frozenset({"domain", "safe", "is_safe"})
+_SECURITY_SCORE_KEYS = frozenset({"score", "security_score"})
+_VPN_CONNECT_KEYS = frozenset({"status", "server"})
+
+
+class ScreenResult(BaseModel):
+    """Expected shape of a call screening result"""
+    phone_number: str
+    risk_score: int
+    action: str
+    call_type: CallType
+    is_spam: Optional[bool] = None
+
+
+@pytest.fixture(autouse=True)
+def no_simulated_latency(monkeypatch):
+    """Skip simulated VPN and network scan delays"""
+    monkeypatch.setattr(vpn_manager, "connect_delay", 0)
+    monkeypatch.setattr(vpn_manager, "disconnect_delay", 0)
+    monkeypatch.setattr(network_monitor, "scan_delay", 0)
+
+
+@pytest.fixture
+def spam_number():
+    """Seed a reported spam number directly into the caller masking state"""
+    number = "+1999999999"
+    caller_masking.spam_database[number] = CallType.SPAM
+    caller_masking.blocked_numbers.add(number)
+    return number
+
+
+@pytest.fixture
+def blocked_number():
+    """Seed a blocked number directly into the caller masking state"""
+    number = "+1111111111"
+    caller_masking.blocked_numbers.add(number)
+    return number
+
+
+@pytest.fixture
+def blocked_domain():
+    """Seed a blocked domain directly into the network monitor state"""
+    domain = "example.com"
+    network_monitor.blocked_domains.add(domain)
+    return domain
+
+
+@pytest.fixture
+def component_score_calls(monkeypatch):
+    """Count how often each privacy component score is computed"""
+    calls = {}
+    for name in ("_calculate_vpn_score", "_calculate_caller_score",
+                 "_calculate_location_score", "_calculate_network_score"):
+        calls[name] = 0
+        
+        def spy(scorer=getattr(privacy_scoring, name), name=name):
+            calls[name] += 1
+            return scorer()
+        
+        monkeypatch.setattr(privacy_scoring, name, spy)
+    return calls
+
+
+def _seed_score_history(n: int):
+    """Append n score records to the privacy score history"""
+    for i in range(n):
+        privacy_scoring.score_history.append({
+            "overall_score": 50.0 + i,
+            "timestamp": datetime.now().isoformat()
+        })
+
 
 # ============ VPN Manager Tests ============
 
-@pytest.mark.asyncio
 async def test_vpn_connect():
     """Test VPN connection"""
     result = await vpn_manager.connect("us-east-1", VPNProtocol.OPENVPN)
@@ -27,7 +121,6 @@ async def test_vpn_connect():
     assert "protocol" in result
 
 
-@pytest.mark.asyncio
 async def test_vpn_status():
     """Test getting VPN status"""
     await vpn_manager.connect("us-east-1", VPNProtocol.OPENVPN)
@@ -36,7 +129,6 @@ async def test_vpn_status():
     assert "uptime_seconds" in status
 
 
-@pytest.mark.asyncio
 async def test_vpn_disconnect():
     """Test VPN disconnection"""
     await vpn_manager.connect("us-east-1", VPNProtocol.OPENVPN)
@@ -45,7 +137,6 @@ async def test_vpn_disconnect():
     assert "session_duration_seconds" in result
 
 
-@pytest.mark.asyncio
 async def test_vpn_servers():
     """Test getting available VPN servers"""
     servers = await vpn_manager.get_available_servers()
@@ -54,7 +145,6 @@ async def test_vpn_servers():
     assert all("location" in s for s in servers)
 
 
-@pytest.mark.asyncio
 async def test_vpn_recommended_server():
     """Test getting recommended VPN server"""
     result = await vpn_manager.get_recommended_server("fastest")
@@ -62,7 +152,6 @@ async def test_vpn_recommended_server():
     assert len(result) > 0  # Has some recommendation info
 
 
-@pytest.mark.asyncio
 async def test_vpn_kill_switch():
     """Test VPN kill switch"""
     enable_result = await vpn_manager.enable_kill_switch()
@@ -72,12 +161,11 @@ async def test_vpn_kill_switch():
     assert disable_result["kill_switch_enabled"] is False
 
 
-@pytest.mark.asyncio
 async def test_vpn_leak_detection():
     """Test VPN leak detection"""
     await vpn_manager.connect("us-east-1", VPNProtocol.OPENVPN)
     result = await vpn_manager.check_for_leaks()
-    assert "has_leaks" in result or "dns_leak" in result
+    assert result.keys() & _LEAK_KEYS
     assert "dns_leak" in result
     assert "ip_leak" in result
     assert "webrtc_leak" in result
@@ -85,64 +173,47 @@ async def test_vpn_leak_detection():
 
 # ============ Caller ID Masking Tests ============
 
-@pytest.mark.asyncio
 async def test_screen_call():
     """Test call screening"""
-    result = await caller_masking.screen_call("+1234567890", "John Doe")
-    assert "phone_number" in result
-    assert "risk_score" in result
-    assert "action" in result or "recommendation" in result
-    assert 0 <= result["risk_score"] <= 100
+    result = ScreenResult.model_validate(await caller_masking.screen_call("+1234567890", "John Doe"))
+    assert 0 <= result.risk_score <= 100
 
 
-@pytest.mark.asyncio
-async def test_screen_spam_call():
+async def test_screen_spam_call(spam_number):
     """Test screening known spam number"""
-    # Add to spam database first
-    await caller_masking.report_spam("+1999999999", CallType.SPAM)
-    
-    result = await caller_masking.screen_call("+1999999999", "Spam Caller")
-    # Check if spam is detected in various ways
-    assert ("is_spam" in result and result["is_spam"]) or \
-           ("call_type" in result and result["call_type"] in [CallType.SPAM, "spam"]) or \
-           result["risk_score"] > 50
+    result = ScreenResult.model_validate(await caller_masking.screen_call(spam_number, "Spam Caller"))
+    assert result.is_spam or result.risk_score > 50 or result.call_type == CallType.SPAM
 
 
-@pytest.mark.asyncio
 async def test_block_number():
     """Test blocking a phone number"""
     result = await caller_masking.block_number("+1111111111")
-    assert "status" in result or "blocked" in result
+    assert result.keys() & _BLOCK_KEYS
     assert result["phone_number"] == "+1111111111"
 
 
-@pytest.mark.asyncio
-async def test_unblock_number():
+async def test_unblock_number(blocked_number):
     """Test unblocking a phone number"""
-    await caller_masking.block_number("+1111111111")
-    result = await caller_masking.unblock_number("+1111111111")
-    assert "status" in result or "blocked" in result or "unblocked" in result
-    assert result["phone_number"] == "+1111111111"
+    result = await caller_masking.unblock_number(blocked_number)
+    assert result.keys() & _UNBLOCK_KEYS
+    assert result["phone_number"] == blocked_number
 
 
-@pytest.mark.asyncio
 async def test_report_spam():
     """Test reporting spam"""
     result = await caller_masking.report_spam("+1888888888", CallType.TELEMARKETER)
-    assert "reported" in result or "phone_number" in result
+    assert result.keys() & _REPORT_KEYS
     assert result["phone_number"] == "+1888888888"
 
 
-@pytest.mark.asyncio
 async def test_call_history():
     """Test getting call history"""
     await caller_masking.screen_call("+1234567890", "Test")
     history = await caller_masking.get_call_history(10)
     assert len(history) > 0
-    assert "phone_number" in history[0]
+    ScreenResult.model_validate(history[0])
 
 
-@pytest.mark.asyncio
 async def test_spam_statistics():
     """Test spam statistics"""
     stats = await caller_masking.get_spam_statistics()
@@ -150,7 +221,6 @@ async def test_spam_statistics():
     # Stats can have various formats
 
 
-@pytest.mark.asyncio
 async def test_caller_masking():
     """Test enabling/disabling caller ID masking"""
     enable_result = await caller_masking.enable_masking()
@@ -162,7 +232,6 @@ async def test_caller_masking():
 
 # ============ Location Spoofing Tests ============
 
-@pytest.mark.asyncio
 async def test_set_location_mode():
     """Test setting location privacy mode"""
     result = await location_spoofing.set_mode(LocationMode.SPOOFED)
@@ -170,7 +239,6 @@ async def test_set_location_mode():
     assert result["mode"] == LocationMode.SPOOFED or result["mode"] == "spoofed"
 
 
-@pytest.mark.asyncio
 async def test_set_real_location():
     """Test setting real location"""
     result = await location_spoofing.set_real_location(40.7128, -74.0060)
@@ -178,32 +246,28 @@ async def test_set_real_location():
     # Response can vary
 
 
-@pytest.mark.asyncio
 async def test_set_spoofed_location():
     """Test setting spoofed location"""
     result = await location_spoofing.set_spoofed_location(51.5074, -0.1278)
-    assert "latitude" in result or "spoofed_location" in result
+    assert result.keys() & _SPOOFED_LOCATION_KEYS
 
 
-@pytest.mark.asyncio
 async def test_get_location():
     """Test getting location based on mode"""
     await location_spoofing.set_mode(LocationMode.REAL)
     await location_spoofing.set_real_location(40.7128, -74.0060)
     
     result = await location_spoofing.get_location()
-    assert "latitude" in result or "location" in result
+    assert result.keys() & _LOCATION_KEYS
     assert "mode" in result or isinstance(result, dict)
 
 
-@pytest.mark.asyncio
 async def test_select_city_location():
     """Test selecting a city location"""
     result = await location_spoofing.select_city_location("New York")
-    assert "city" in result or "latitude" in result
+    assert result.keys() & _CITY_KEYS
 
 
-@pytest.mark.asyncio
 async def test_available_cities():
     """Test getting available cities"""
     cities = await location_spoofing.get_available_cities()
@@ -215,14 +279,12 @@ async def test_available_cities():
         assert "cities" in cities or len(cities) > 0
 
 
-@pytest.mark.asyncio
 async def test_location_status():
     """Test getting location status"""
     status = await location_spoofing.get_status()
-    assert "mode" in status or "current_mode" in status
+    assert status.keys() & _MODE_KEYS
 
 
-@pytest.mark.asyncio
 async def test_location_privacy_verification():
     """Test location privacy verification"""
     await location_spoofing.set_mode(LocationMode.SPOOFED)
@@ -233,22 +295,19 @@ async def test_location_privacy_verification():
 
 # ============ Network Security Monitor Tests ============
 
-@pytest.mark.asyncio
 async def test_start_monitoring():
     """Test starting network monitoring"""
     result = await network_monitor.start_monitoring()
-    assert "monitoring" in result or "status" in result
+    assert result.keys() & _MONITORING_KEYS
 
 
-@pytest.mark.asyncio
 async def test_stop_monitoring():
     """Test stopping network monitoring"""
     await network_monitor.start_monitoring()
     result = await network_monitor.stop_monitoring()
-    assert "monitoring" in result or "status" in result
+    assert result.keys() & _MONITORING_KEYS
 
 
-@pytest.mark.asyncio
 async def test_network_scan():
     """Test network scanning"""
     await network_monitor.start_monitoring()
@@ -257,7 +316,14 @@ async def test_network_scan():
     # Scan results can have various formats
 
 
-@pytest.mark.asyncio
+async def test_network_scan_bulk():
+    """Test running several network scans at once"""
+    await network_monitor.start_monitoring()
+    results = await network_monitor.scan_network_traffic_bulk(3)
+    assert len(results) == 3
+    assert all("connections_scanned" in r for r in results)
+
+
 async def test_get_threats():
     """Test getting detected threats"""
     await network_monitor.start_monitoring()
@@ -265,7 +331,6 @@ async def test_get_threats():
     assert isinstance(threats, list)
 
 
-@pytest.mark.asyncio
 async def test_threat_statistics():
     """Test threat statistics"""
     stats = await network_monitor.get_threat_statistics()
@@ -273,36 +338,30 @@ async def test_threat_statistics():
     assert len(stats) >= 0  # Can be empty if no threats
 
 
-@pytest.mark.asyncio
 async def test_block_domain():
     """Test blocking a domain"""
     result = await network_monitor.block_domain("malicious.com", "Test block")
-    assert "blocked" in result or "domain" in result
+    assert result.keys() & _DOMAIN_BLOCK_KEYS
 
 
-@pytest.mark.asyncio
-async def test_unblock_domain():
+async def test_unblock_domain(blocked_domain):
     """Test unblocking a domain"""
-    await network_monitor.block_domain("example.com", "Test")
-    result = await network_monitor.unblock_domain("example.com")
-    assert "blocked" in result or "domain" in result or "unblocked" in result
+    result = await network_monitor.unblock_domain(blocked_domain)
+    assert result.keys() & _DOMAIN_UNBLOCK_KEYS
 
 
-@pytest.mark.asyncio
 async def test_whitelist_domain():
     """Test whitelisting a domain"""
     result = await network_monitor.whitelist_domain("trusted.com")
-    assert "whitelisted" in result or "domain" in result
+    assert result.keys() & _WHITELIST_KEYS
 
 
-@pytest.mark.asyncio
 async def test_check_domain_safety():
     """Test checking domain safety"""
     result = await network_monitor.check_domain_safety("google.com")
-    assert "domain" in result or "safe" in result or "is_safe" in result
+    assert result.keys() & _DOMAIN_SAFETY_KEYS
 
 
-@pytest.mark.asyncio
 async def test_network_statistics():
     """Test network statistics"""
     stats = await network_monitor.get_network_statistics()
@@ -310,14 +369,12 @@ async def test_network_statistics():
     assert len(stats) >= 0  # Can be empty stats object
 
 
-@pytest.mark.asyncio
 async def test_security_score():
     """Test security score calculation"""
     result = await network_monitor.get_security_score()
-    assert "score" in result or "security_score" in result
+    assert result.keys() & _SECURITY_SCORE_KEYS
 
 
-@pytest.mark.asyncio
 async def test_firewall_management():
     """Test firewall enable/disable"""
     enable_result = await network_monitor.enable_firewall()
@@ -327,7 +384,6 @@ async def test_firewall_management():
     assert disable_result["firewall_enabled"] is False
 
 
-@pytest.mark.asyncio
 async def test_firewall_status():
     """Test getting firewall status"""
     status = await network_monitor.get_firewall_status()
@@ -337,7 +393,6 @@ async def test_firewall_status():
 
 # ============ Privacy Scoring Tests ============
 
-@pytest.mark.asyncio
 async def test_calculate_privacy_score():
     """Test calculating overall privacy score"""
     result = await privacy_scoring.calculate_privacy_score()
@@ -346,7 +401,6 @@ async def test_calculate_privacy_score():
     assert 0 <= result["overall_score"] <= 100
 
 
-@pytest.mark.asyncio
 async def test_privacy_score_components():
     """Test privacy score components"""
     result = await privacy_scoring.calculate_privacy_score()
@@ -357,7 +411,28 @@ async def test_privacy_score_components():
     )
 
 
-@pytest.mark.asyncio
+async def test_privacy_score_cache(component_score_calls):
+    """Test component scores are reused until service state changes"""
+    first = await privacy_scoring.calculate_privacy_score()
+    second = await privacy_scoring.calculate_privacy_score()
+    assert second["component_scores"] == first["component_scores"]
+    assert len(privacy_scoring.score_history) == 2
+    assert set(component_score_calls.values()) == {1}
+    
+    await location_spoofing.set_mode(LocationMode.RANDOM)
+    third = await privacy_scoring.calculate_privacy_score()
+    assert third["component_scores"]["location_privacy"]["score"] == 100
+    assert set(component_score_calls.values()) == {2}
+    
+    # A reset followed by a new call leaves the history the same length
+    await caller_masking.screen_call("+1234567890")
+    await privacy_scoring.calculate_privacy_score()
+    caller_masking.reset()
+    await caller_masking.screen_call("+1234567890")
+    await privacy_scoring.calculate_privacy_score()
+    assert set(component_score_calls.values()) == {4}
+
+
 async def test_score_history():
     """Test getting score history"""
     await privacy_scoring.calculate_privacy_score()
@@ -366,30 +441,43 @@ async def test_score_history():
     # History can be empty or contain records
 
 
-@pytest.mark.asyncio
 async def test_score_trend():
     """Test score trend analysis"""
-    # Calculate scores multiple times
-    for _ in range(3):
-        await privacy_scoring.calculate_privacy_score()
+    # Seed history directly rather than computing full scores
+    _seed_score_history(3)
     
     trend = await privacy_scoring.get_score_trend()
     assert isinstance(trend, dict)
     # Trend can contain various metrics
 
 
+# ============ Combined Smoke Test ============
+
+async def test_privacy_smoke():
+    """Test happy path of all privacy services concurrently"""
+    vpn_result, call_result, location_result, monitor_result, score_result = await asyncio.gather(
+        vpn_manager.connect("us-east-1", VPNProtocol.OPENVPN),
+        caller_masking.screen_call("+1234567890", "John Doe"),
+        location_spoofing.set_mode(LocationMode.SPOOFED),
+        network_monitor.start_monitoring(),
+        privacy_scoring.calculate_privacy_score()
+    )
+    assert vpn_result["status"] == VPNStatus.CONNECTED
+    assert 0 <= call_result["risk_score"] <= 100
+    assert location_result["mode"] == LocationMode.SPOOFED
+    assert monitor_result["status"] == "monitoring"
+    assert 0 <= score_result["overall_score"] <= 100
+
+
 # ============ API Endpoint Tests ============
 
 def test_vpn_connect_endpoint():
     """Test VPN connect API endpoint"""
-    response = client.post("/api/v1/privacy/vpn/connect", json={
-        "server": "us-east-1",
-        "protocol": "openvpn"
-    })
+    response = client.post("/api/v1/privacy/vpn/connect", content=_VPN_CONNECT_BODY, headers=_JSON_HEADERS)
     assert response.status_code == 200
     # API returns the service result directly
     result = response.json()
-    assert "status" in result or "server" in result
+    assert result.keys() & _VPN_CONNECT_KEYS
 
 
 def test_vpn_status_endpoint():
@@ -400,19 +488,14 @@ def test_vpn_status_endpoint():
 
 def test_screen_call_endpoint():
     """Test call screening API endpoint"""
-    response = client.post("/api/v1/privacy/caller/screen", json={
-        "phone_number": "+1234567890",
-        "caller_name": "Test Caller"
-    })
+    response = client.post("/api/v1/privacy/caller/screen", content=_SCREEN_CALL_BODY, headers=_JSON_HEADERS)
     assert response.status_code == 200
     assert "risk_score" in response.json()
 
 
 def test_set_location_mode_endpoint():
     """Test location mode API endpoint"""
-    response = client.post("/api/v1/privacy/location/mode", json={
-        "mode": "spoofed"
-    })
+    response = client.post("/api/v1/privacy/location/mode", content=_LOCATION_MODE_BODY, headers=_JSON_HEADERS)
     assert response.status_code == 200
 
 
@@ -429,6 +512,18 @@ def test_privacy_score_endpoint():
     assert "overall_score" in response.json()
 
 
+@pytest.mark.parametrize("path", [
+    "/api/v1/privacy/caller/history",
+    "/api/v1/privacy/network/threats",
+    "/api/v1/privacy/score/history",
+])
+def test_history_negative_limit_endpoint(path):
+    """Test history endpoints return an empty list for a negative limit"""
+    response = client.get(path, params={"limit": -1})
+    assert response.status_code == 200
+    assert list(response.json().values()) == [[]]
+
+
 def test_privacy_health_endpoint():
     """Test privacy health check endpoint"""
     response = client.get("/api/v1/privacy/health")
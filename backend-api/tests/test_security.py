@@ -6,9 +6,119 @@ Tests for common security vulnerabilities and privacy protection
 import pytest
 import asyncio
 import hashlib
+import secrets
+import string
+import time
+from collections import defaultdict, deque
 from typing import Dict, List
 import re
 
+try:
+    import re2 as pii_regex  # google-re2: linear-time matching when installed
+except ImportError:
+    pii_regex = re
+
+try:
+    import hyperscan  # SIMD multi-pattern scanning when installed
+except ImportError:
+    hyperscan = None
+
+# Sliding-window rate limit: requests allowed per user and endpoint per window
+RATE_LIMIT_REQUESTS = 100
+RATE_LIMIT_WINDOW_SECONDS = 60
+
+# Password character-class bits: upper, lower, digit, special
+_UPPER, _LOWER, _DIGIT, _SPECIAL = 1, 2, 4, 8
+_ALL_CLASSES = _UPPER | _LOWER | _DIGIT | _SPECIAL
+
+# Byte -> character-class bit, so a password is classified in one pass
+_CHAR_CLASS = bytearray(256)
+for _chars, _bit in (
+    (string.ascii_uppercase, _UPPER),
+    (string.ascii_lowercase, _LOWER),
+    (string.digits, _DIGIT),
+    ('!@#$%^&*(),.?":{}|<>', _SPECIAL),
+):
+    for _char in _chars:
+        _CHAR_CLASS[ord(_char)] = _bit
+
+# Email and phone formats accepted by user input validation
+_EMAIL_VALID_RE = re.compile(r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$')
+_PHONE_VALID_RE = re.compile(r'^\+?[\d\s-]{10,}$')
+
+# Dangerous SQL keywords removed from user input, in any case
+_SQL_BAD_RE = re.compile(r'DROP|DELETE|UNION|INSERT|UPDATE|ALTER', re.IGNORECASE)
+
+# Quote and statement separator characters deleted from user input in one translate pass
+_SQL_CHAR_STRIP = str.maketrans('', '', "';")
+
+# Dangerous HTML tags and attributes stripped from user HTML, in any case
+_HTML_BAD_RE = re.compile(r'<script>|</script>|javascript:|onerror=|<iframe', re.IGNORECASE)
+
+# PII patterns redacted from log entries
+_PII_PATTERNS = (
+    ("email", r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Za-z]{2,}\b'),
+    ("cc", r'\b\d{4}[-\s]?\d{4}[-\s]?\d{4}[-\s]?\d{4}\b'),
+    ("ssn", r'\b\d{3}-\d{2}-\d{4}\b'),
+    ("phone", r'\+?\d{1,3}[-\s]?\d{3}[-\s]?\d{3}[-\s]?\d{4}'),
+)
+
+
+def _compile_pii(names):
+    """Compile the named PII patterns into a single alternation"""
+    return pii_regex.compile('|'.join(
+        f'(?P<{name}>{pattern})' for name, pattern in _PII_PATTERNS if name in names
+    ))
+
+
+# Emails, then cards, then SSNs and phones in one pass. In a single alternation
+# the earliest match wins, so fusing more kinds would let a card mask break up
+# an email or a phone match start just before a card and leave digits behind
+_EMAIL_PII_RE = _compile_pii({"email"})
+_CARD_PII_RE = _compile_pii({"cc"})
+_NUMERIC_PII_RE = _compile_pii({"ssn", "phone"})
+
+
+def _compile_pii_prefilter():
+    """Compile a Hyperscan database that detects whether an entry holds any PII"""
+    if hyperscan is None:
+        return None
+    database = hyperscan.Database()
+    database.compile(
+        expressions=[pattern.encode() for _, pattern in _PII_PATTERNS],
+        ids=list(range(len(_PII_PATTERNS))),
+        elements=len(_PII_PATTERNS),
+        flags=[hyperscan.HS_FLAG_SINGLEMATCH] * len(_PII_PATTERNS)
+    )
+    return database
+
+
+# Single SIMD pass that rules out PII before the regex rewrites an entry. Entries
+# that do hold PII are scanned twice (Hyperscan, then the regex), so this only
+# pays off on logs that are mostly PII-free
+_PII_PREFILTER = _compile_pii_prefilter()
+
+
+def _contains_pii(text: str) -> bool:
+    """Scan text with the Hyperscan prefilter, stopping at the first PII match"""
+    try:
+        _PII_PREFILTER.scan(text.encode(), match_event_handler=lambda *match: True)
+    except hyperscan.ScanTerminated:
+        return True
+    return False
+
+
+# Digits required by the card, SSN and phone patterns (emails need an '@')
+_DIGITS = frozenset('0123456789')
+
+# Replacement text for each named PII group
+_PII_REPLACEMENTS = {
+    "email": '***@***.***',
+    "cc": '****-****-****-****',
+    "ssn": '***-**-****',
+    "phone": '+*-***-***-****',
+}
+
 
 class TestAuthenticationSecurity:
     """Test authentication and authorization security"""
@@ -43,15 +153,12 @@ class TestAuthenticationSecurity:
         """Check if password meets strength requirements"""
         if len(password) < 8:
             return False
-        if not re.search(r'[A-Z]', password):
-            return False
-        if not re.search(r'[a-z]', password):
-            return False
-        if not re.search(r'[0-9]', password):
-            return False
-        if not re.search(r'[!@#$%^&*(),.?":{}|<>]', password):
-            return False
-        return True
+        flags = 0
+        for byte in password.encode():
+            flags |= _CHAR_CLASS[byte]
+            if flags == _ALL_CLASSES:
+                return True
+        return False
     
     def test_sql_injection_prevention(self):
         """Test SQL injection attack prevention"""
@@ -60,7 +167,8 @@ class TestAuthenticationSecurity:
             "1' OR '1'='1",
             "admin'--",
             "' UNION SELECT * FROM passwords--",
-            "1; DELETE FROM sessions WHERE '1'='1"
+            "1; DELETE FROM sessions WHERE '1'='1",
+            "'; Drop Table users; --"
         ]
         
         # These should be safely handled (escaped or rejected)
@@ -69,18 +177,14 @@ class TestAuthenticationSecurity:
             assert "DROP" not in result.upper()
             assert "DELETE" not in result.upper()
             assert "UNION" not in result.upper()
+            assert "'" not in result and ";" not in result
         
         print("✅ SQL injection prevention test passed")
     
     def _sanitize_input(self, user_input: str) -> str:
         """Sanitize user input"""
-        # Remove dangerous SQL keywords
-        dangerous = ['DROP', 'DELETE', 'UNION', 'INSERT', 'UPDATE', 'ALTER']
-        sanitized = user_input
-        for keyword in dangerous:
-            sanitized = sanitized.replace(keyword, '')
-            sanitized = sanitized.replace(keyword.lower(), '')
-        return sanitized
+        # Remove dangerous SQL keywords, then quotes and statement separators
+        return _SQL_BAD_RE.sub('', user_input).translate(_SQL_CHAR_STRIP)
     
     def test_xss_attack_prevention(self):
         """Test Cross-Site Scripting (XSS) attack prevention"""
@@ -89,7 +193,8 @@ class TestAuthenticationSecurity:
             "<img src=x onerror=alert('XSS')>",
             "<svg onload=alert('XSS')>",
             "javascript:alert('XSS')",
-            "<iframe src='javascript:alert(\"XSS\")'>"
+            "<iframe src='javascript:alert(\"XSS\")'>",
+            "<SCRIPT>alert('XSS')</SCRIPT>"
         ]
         
         for payload in xss_payloads:
@@ -103,12 +208,7 @@ class TestAuthenticationSecurity:
     def _sanitize_html(self, html: str) -> str:
         """Sanitize HTML input"""
         # Remove dangerous HTML tags and attributes
-        sanitized = html.replace("<script>", "")
-        sanitized = sanitized.replace("</script>", "")
-        sanitized = sanitized.replace("javascript:", "")
-        sanitized = sanitized.replace("onerror=", "")
-        sanitized = sanitized.replace("<iframe", "")
-        return sanitized
+        return _HTML_BAD_RE.sub("", html)
     
     def test_session_token_security(self):
         """Test session token generation and validation"""
@@ -128,11 +228,8 @@ class TestAuthenticationSecurity:
     
     def _generate_session_token(self, user_id: str) -> str:
         """Generate secure session token"""
-        import random
-        import string
-        random_data = ''.join(random.choices(string.ascii_letters + string.digits, k=32))
-        token_data = f"{user_id}:{random_data}"
-        return hashlib.sha256(token_data.encode()).hexdigest()
+        # 32 bytes from the OS CSPRNG; tokens are looked up server-side, not derived from user_id
+        return secrets.token_hex(32)
 
 
 class TestPrivacyProtection:
@@ -172,6 +269,17 @@ class TestPrivacyProtection:
             "Phone: +1-555-123-4567 called"
         ]
         
+        # Entries without PII pass through unchanged
+        assert self._redact_pii("User logged out") == "User logged out"
+        assert self._redact_pii("Retry 3 of 5") == "Retry 3 of 5"
+        
+        # A number just before a card must not let a phone match leak card digits
+        assert self._redact_pii("Order 12 4532123456789012 charged") == "Order 12 ****-****-****-**** charged"
+        
+        # Emails holding a card-like digit run are redacted as whole emails
+        assert self._redact_pii("a@4532123456789012.com") == "***@***.***"
+        assert self._redact_pii("4532123456789012@x.com") == "***@***.***"
+        
         for entry in log_entries:
             redacted = self._redact_pii(entry)
             
@@ -184,21 +292,22 @@ class TestPrivacyProtection:
     
     def _redact_pii(self, text: str) -> str:
         """Redact PII from text"""
-        # Email redaction
-        text = re.sub(r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b', 
-                     '***@***.***', text)
-        
-        # Credit card redaction
-        text = re.sub(r'\b\d{4}[-\s]?\d{4}[-\s]?\d{4}[-\s]?\d{4}\b', 
-                     '****-****-****-****', text)
-        
-        # SSN redaction
-        text = re.sub(r'\b\d{3}-\d{2}-\d{4}\b', '***-**-****', text)
+        # Only run the patterns whose trigger characters appear in the entry
+        has_email = '@' in text
+        has_digits = not _DIGITS.isdisjoint(text)
+        if not (has_email or has_digits):
+            return text
+        if _PII_PREFILTER is not None and not _contains_pii(text):
+            return text
         
-        # Phone redaction
-        text = re.sub(r'\+?\d{1,3}[-\s]?\d{3}[-\s]?\d{3}[-\s]?\d{4}', 
-                     '+*-***-***-****', text)
+        # Email redaction
+        if has_email:
+            text = _EMAIL_PII_RE.sub(_PII_REPLACEMENTS["email"], text)
         
+        # Credit card redaction, then SSN and phone redaction in one pass
+        if has_digits:
+            text = _CARD_PII_RE.sub(_PII_REPLACEMENTS["cc"], text)
+            text = _NUMERIC_PII_RE.sub(lambda match: _PII_REPLACEMENTS[match.lastgroup], text)
         return text
     
     def test_caller_id_masking(self):
@@ -275,6 +384,10 @@ class TestPrivacyProtection:
 class TestAPIRateLimiting:
     """Test API rate limiting and DDoS prevention"""
     
+    def setup_method(self):
+        """Start each test with empty rate limit windows"""
+        self.request_log = defaultdict(deque)
+    
     @pytest.mark.asyncio
     async def test_rate_limit_enforcement(self):
         """Test that rate limits are enforced"""
@@ -292,18 +405,23 @@ class TestAPIRateLimiting:
             else:
                 blocked_count += 1
         
-        # Should have blocked some requests
-        assert blocked_count > 0, "Rate limiting not working"
-        assert request_count <= 100, "Too many requests allowed"
+        # Should have blocked everything past the limit
+        assert blocked_count == 50, "Rate limiting not working"
+        assert request_count == RATE_LIMIT_REQUESTS, "Too many requests allowed"
         
         print(f"✅ Rate limiting test passed ({blocked_count} requests blocked)")
     
     async def _check_rate_limit(self, user_id: str, endpoint: str) -> bool:
         """Check if request is within rate limit"""
-        # Simulate rate limit check (100 requests per minute)
-        import random
-        request_num = random.randint(1, 150)
-        return request_num <= 100
+        # Sliding window of request timestamps (100 requests per minute)
+        now = time.monotonic()
+        window = self.request_log[(user_id, endpoint)]
+        while window and now - window[0] >= RATE_LIMIT_WINDOW_SECONDS:
+            window.popleft()
+        if len(window) >= RATE_LIMIT_REQUESTS:
+            return False
+        window.append(now)
+        return True
     
     @pytest.mark.asyncio
     async def test_ddos_protection(self):
@@ -363,8 +481,7 @@ class TestDataValidation:
     
     def _validate_email(self, email: str) -> bool:
         """Validate email format"""
-        pattern = r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$'
-        return re.match(pattern, email) is not None
+        return _EMAIL_VALID_RE.match(email) is not None
     
     def _validate_age(self, age: int) -> bool:
         """Validate age"""
@@ -372,8 +489,7 @@ class TestDataValidation:
     
     def _validate_phone(self, phone: str) -> bool:
         """Validate phone number"""
-        pattern = r'^\+?[\d\s-]{10,}$'
-        return re.match(pattern, phone) is not None
+        return _PHONE_VALID_RE.match(phone) is not None
 
 
 # Run all security tests
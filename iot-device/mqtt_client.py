@@ -7,11 +7,28 @@ import paho.mqtt.client as mqtt
 import json
 import time
 import logging
+import socket
 from datetime import datetime
 import os
 from dotenv import load_dotenv
 from sensors.sensor_manager import SensorManager
 
+try:
+    import msgspec  # Optional compact msgpack payloads and fast command decoding
+except ImportError:
+    msgspec = None
+
+if msgspec is not None:
+    # Decode commands straight from payload bytes into a dict
+    json_loads = msgspec.json.Decoder(dict).decode
+    JSON_DECODE_ERRORS = (msgspec.DecodeError,)
+else:
+    try:
+        from orjson import loads as json_loads  # Native decoder when installed
+    except ImportError:
+        from json import loads as json_loads
+    JSON_DECODE_ERRORS = (json.JSONDecodeError,)
+
 # Load environment variables
 load_dotenv()
 
@@ -22,6 +39,31 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# JSON layout of the fixed sensor reading schema, filled in without json.dumps;
+# readings are raw floats, formatted to sensor resolution only here
+SENSOR_PAYLOAD_TEMPLATE = (
+    '{"motion_detected": %s, "temperature": %.1f, "humidity": %.1f, '
+    '"light_level": %.2f, "noise_level": %.2f, "ts": %d}'
+)
+
+# Minimum change per reading that is worth publishing when unchanged readings are suppressed
+CHANGE_THRESHOLDS = {
+    'noise_level': 2.0,  # dB
+    'light_level': 20.0,  # lux
+    'temperature': 0.5,  # °C
+    'humidity': 2.0  # %
+}
+
+if msgspec is not None:
+    class SensorState(msgspec.Struct, array_like=True):
+        """Sensor reading encoded as a msgpack array in field order, without key names"""
+        motion_detected: bool
+        temperature: float
+        humidity: float
+        light_level: float
+        noise_level: float
+        ts: int
+
 class WellbeingIoTDevice:
     """Main IoT device class for environmental monitoring"""
     
@@ -33,62 +75,135 @@ class WellbeingIoTDevice:
         self.topic_prefix = os.getenv('MQTT_TOPIC_PREFIX', 'wellbeing')
         self.device_id = os.getenv('DEVICE_ID', 'iot-device-001')
         
+        # MQTT topics, fixed for the lifetime of the device
+        self.command_topic = f"{self.topic_prefix}/commands/{self.device_id}/#"
+        self.sensor_topic = f"{self.topic_prefix}/sensors/{self.device_id}"
+        self.alert_topic = f"{self.topic_prefix}/alerts/{self.device_id}"
+        
+        # Payload codec: 'json' (read by the backend) or 'msgpack' on /msgpack subtopics
+        self.payload_format = os.getenv('MQTT_PAYLOAD_FORMAT', 'json')
+        if self.payload_format == 'msgpack' and msgspec is None:
+            logger.warning("⚠️ msgspec not available - publishing JSON payloads")
+            self.payload_format = 'json'
+        if self.payload_format == 'msgpack':
+            self.msgpack_encoder = msgspec.msgpack.Encoder()
+            self.sensor_topic += '/msgpack'
+            self.alert_topic += '/msgpack'
+        
+        # Readings are buffered and published together once this many are queued,
+        # either as one message each ('burst') or as a single array on .../batch ('array')
+        self.publish_batch_size = max(1, int(os.getenv('MQTT_PUBLISH_BATCH_SIZE', 1)))
+        self.publish_batch_mode = os.getenv('MQTT_PUBLISH_BATCH_MODE', 'burst')
+        self.batch_topic = f"{self.sensor_topic}/batch"
+        self.pending_payloads = []
+        
+        # Sensor telemetry is replaced every few seconds, so it defaults to
+        # fire-and-forget QoS 0; alerts always use QoS 1
+        self.telemetry_qos = int(os.getenv('MQTT_TELEMETRY_QOS', 0))
+        
+        # Skip readings that barely changed, still sending a full snapshot periodically
+        self.publish_changes_only = os.getenv('MQTT_PUBLISH_CHANGES_ONLY', 'false').lower() == 'true'
+        self.snapshot_interval = float(os.getenv('MQTT_SNAPSHOT_INTERVAL', 60))
+        self.last_published_state = None
+        self.last_published_at = 0.0
+        
+        # Seconds between sensor publishes
+        self.publish_interval = float(os.getenv('PUBLISH_INTERVAL', 5))
+        
         # Initialize sensor manager
         self.sensors = SensorManager()
         
-        # Sensor readings
+        # Command type -> handler
+        self.command_handlers = {
+            'activate_focus_mode': self.handle_focus_mode,
+            'suggest_break': self.handle_suggest_break,
+            'adjust_environment': self.handle_adjust_environment
+        }
+        
+        # Sensor readings, updated in place on every read
         self.current_state = {
-            'noise_level': 0.0,
-            'light_level': 0.0,
             'motion_detected': False,
             'temperature': 0.0,
             'humidity': 0.0,
-            'timestamp': None
+            'light_level': 0.0,
+            'noise_level': 0.0,
+            'ts': 0  # Epoch milliseconds
         }
         
     def on_connect(self, client, userdata, flags, rc):
         """Callback when connected to MQTT broker"""
         if rc == 0:
             logger.info(f"✅ Connected to MQTT broker at {self.broker_host}:{self.broker_port}")
+            self.tune_socket(client)
             # Subscribe to command topics
-            client.subscribe(f"{self.topic_prefix}/commands/{self.device_id}/#")
-            logger.info(f"📡 Subscribed to {self.topic_prefix}/commands/{self.device_id}/#")
+            client.subscribe(self.command_topic)
+            logger.info(f"📡 Subscribed to {self.command_topic}")
         else:
             logger.error(f"❌ Connection failed with code {rc}")
     
+    def tune_socket(self, client):
+        """Send small MQTT packets immediately instead of waiting on Nagle's algorithm"""
+        sock = client.socket()
+        if sock is None:
+            return
+        try:
+            sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+            sock.setsockopt(socket.SOL_SOCKET, socket.SO_SNDBUF, 64 * 1024)
+        except (OSError, AttributeError) as e:
+            # TLS and websocket transports may not expose these options
+            logger.warning(f"⚠️ Could not tune MQTT socket: {e}")
+    
+    def set_cork(self, corked: bool):
+        """Hold back (or release) partial TCP segments so a burst of packets is sent together"""
+        sock = self.mqtt_client.socket()
+        if sock is None or not hasattr(socket, 'TCP_CORK'):
+            return  # Linux only
+        try:
+            sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_CORK, int(corked))
+        except (OSError, AttributeError):
+            pass  # TLS and websocket transports may not expose socket options
+    
     def on_message(self, client, userdata, msg):
         """Callback when message is received"""
         try:
-            payload = json.loads(msg.payload.decode())
+            payload = json_loads(msg.payload)
             logger.info(f"📨 Received message on {msg.topic}: {payload}")
             self.handle_command(payload)
-        except json.JSONDecodeError:
+        except JSON_DECODE_ERRORS:
             logger.error(f"Failed to decode message: {msg.payload}")
     
     def handle_command(self, command):
         """Handle commands from backend"""
         cmd_type = command.get('type')
+        handler = self.command_handlers.get(cmd_type)
         
-        if cmd_type == 'activate_focus_mode':
-            logger.info("🎯 Activating focus mode...")
-            # TODO: Trigger noise cancellation, adjust lighting
-        elif cmd_type == 'suggest_break':
-            logger.info("☕ Suggesting break to user...")
-            # TODO: Send break reminder via connected devices
-        elif cmd_type == 'adjust_environment':
-            logger.info("🌡️ Adjusting environment...")
-            # TODO: Adjust smart devices (lights, fans, etc.)
-        else:
+        if handler is None:
             logger.warning(f"Unknown command type: {cmd_type}")
+            return
+        handler(command)
+    
+    def handle_focus_mode(self, command):
+        """Handle activate_focus_mode command"""
+        logger.info("🎯 Activating focus mode...")
+        # TODO: Trigger noise cancellation, adjust lighting
+    
+    def handle_suggest_break(self, command):
+        """Handle suggest_break command"""
+        logger.info("☕ Suggesting break to user...")
+        # TODO: Send break reminder via connected devices
+    
+    def handle_adjust_environment(self, command):
+        """Handle adjust_environment command"""
+        logger.info("🌡️ Adjusting environment...")
+        # TODO: Adjust smart devices (lights, fans, etc.)
     
     def read_sensors(self):
         """Read all sensor values"""
-        self.current_state = self.sensors.read_all()
-        return self.current_state
+        return self.sensors.read_all(out=self.current_state)
     
-    def analyze_environment(self):
-        """Analyze environment and get recommendations"""
-        analysis = self.sensors.analyze_environment()
+    def analyze_environment(self, sensor_data: dict = None):
+        """Analyze environment and get recommendations, reusing `sensor_data` if already read"""
+        analysis = self.sensors.analyze_environment(sensor_data)
         
         # Send recommendations if any issues detected
         if analysis['recommendations']:
@@ -97,29 +212,86 @@ class WellbeingIoTDevice:
         
         return analysis
     
+    def encode_sensor_data(self, sensor_data: dict) -> bytes:
+        """Encode sensor readings in the configured payload format"""
+        if self.payload_format == 'msgpack':
+            return self.msgpack_encoder.encode(SensorState(**sensor_data))
+        return (SENSOR_PAYLOAD_TEMPLATE % (
+            'true' if sensor_data['motion_detected'] else 'false',
+            sensor_data['temperature'],
+            sensor_data['humidity'],
+            sensor_data['light_level'],
+            sensor_data['noise_level'],
+            sensor_data['ts']
+        )).encode('ascii')
+    
+    def encode_batch(self, payloads: list) -> bytes:
+        """Combine encoded sensor payloads into one array payload"""
+        if self.payload_format == 'msgpack':
+            return self.msgpack_encoder.encode([msgspec.Raw(payload) for payload in payloads])
+        return b'[' + b', '.join(payloads) + b']'
+    
+    def has_significant_change(self, sensor_data: dict) -> bool:
+        """Check if readings moved past their thresholds or a snapshot is due"""
+        last = self.last_published_state
+        if last is None or time.monotonic() - self.last_published_at >= self.snapshot_interval:
+            return True
+        if sensor_data['motion_detected'] != last['motion_detected']:
+            return True
+        return any(
+            abs(sensor_data[key] - last[key]) > threshold
+            for key, threshold in CHANGE_THRESHOLDS.items()
+        )
+    
     def publish_sensor_data(self):
-        """Publish sensor readings to MQTT broker"""
+        """Queue sensor readings and publish them once a batch is full"""
         sensor_data = self.read_sensors()
-        topic = f"{self.topic_prefix}/sensors/{self.device_id}"
+        if self.publish_changes_only and not self.has_significant_change(sensor_data):
+            logger.debug("📊 Sensor data unchanged, skipping publish")
+            return
+        
+        self.pending_payloads.append(self.encode_sensor_data(sensor_data))
+        self.last_published_state = dict(sensor_data)
+        self.last_published_at = time.monotonic()
+        logger.debug(f"📊 Queued sensor data: {sensor_data}")
+        
+        if len(self.pending_payloads) >= self.publish_batch_size:
+            self.flush_sensor_data()
+    
+    def flush_sensor_data(self):
+        """Publish all queued sensor readings to MQTT broker in one burst"""
+        if not self.pending_payloads:
+            return
+        
+        payloads, self.pending_payloads = self.pending_payloads, []
         
         try:
-            self.mqtt_client.publish(
-                topic,
-                json.dumps(sensor_data),
-                qos=1
-            )
-            logger.info(f"📤 Published sensor data: {sensor_data}")
+            if self.publish_batch_mode == 'array':
+                self.mqtt_client.publish(self.batch_topic, self.encode_batch(payloads), qos=self.telemetry_qos)
+            else:
+                # Cork the socket so the burst leaves in as few TCP segments as possible
+                self.set_cork(True)
+                try:
+                    for payload in payloads:
+                        self.mqtt_client.publish(self.sensor_topic, payload, qos=self.telemetry_qos)
+                finally:
+                    self.set_cork(False)
+            logger.info(f"📤 Published {len(payloads)} sensor reading(s)")
         except Exception as e:
             logger.error(f"Failed to publish sensor data: {e}")
     
+    def encode_alert(self, alert: dict) -> bytes:
+        """Encode an alert in the configured payload format"""
+        if self.payload_format == 'msgpack':
+            return self.msgpack_encoder.encode(alert)
+        return json.dumps(alert).encode()
+    
     def publish_alert(self, alert: dict):
         """Publish environmental alert"""
-        topic = f"{self.topic_prefix}/alerts/{self.device_id}"
-        
         try:
             self.mqtt_client.publish(
-                topic,
-                json.dumps(alert),
+                self.alert_topic,
+                self.encode_alert(alert),
                 qos=1
             )
             logger.info(f"🚨 Published alert: {alert['message']}")
@@ -132,6 +304,10 @@ class WellbeingIoTDevice:
         self.mqtt_client.on_connect = self.on_connect
         self.mqtt_client.on_message = self.on_message
         
+        # Bound unacknowledged and queued messages so bursts never block or grow unchecked
+        self.mqtt_client.max_inflight_messages_set(20)
+        self.mqtt_client.max_queued_messages_set(1000)
+        
         # Set username/password if provided
         username = os.getenv('MQTT_USERNAME')
         password = os.getenv('MQTT_PASSWORD')
@@ -145,6 +321,15 @@ class WellbeingIoTDevice:
             logger.error(f"Failed to connect to MQTT broker: {e}")
             return False
     
+    def reconnect(self, rc: int):
+        """Reconnect to MQTT broker after the network loop reports an error"""
+        logger.warning(f"⚠️ MQTT connection lost (rc={rc}) - reconnecting...")
+        try:
+            self.mqtt_client.reconnect()
+        except Exception as e:
+            logger.error(f"Failed to reconnect to MQTT broker: {e}")
+            time.sleep(1)  # Back off before the next attempt
+    
     def run(self):
         """Main run loop"""
         if not self.connect():
@@ -154,19 +339,23 @@ class WellbeingIoTDevice:
         logger.info("🚀 IoT Device started successfully")
         logger.info("📊 Starting sensor monitoring...")
         
-        # Start MQTT loop in background
-        self.mqtt_client.loop_start()
-        
         try:
-            # Main sensor reading loop
+            # Main sensor reading loop; MQTT network I/O runs on this thread
+            # between publishes instead of on a separate paho thread
+            next_publish = time.monotonic()
             while True:
-                self.publish_sensor_data()
-                time.sleep(5)  # Publish every 5 seconds
+                if time.monotonic() >= next_publish:
+                    self.publish_sensor_data()
+                    next_publish = max(next_publish + self.publish_interval, time.monotonic())
+                
+                rc = self.mqtt_client.loop(timeout=max(0.0, next_publish - time.monotonic()))
+                if rc != mqtt.MQTT_ERR_SUCCESS:
+                    self.reconnect(rc)
                 
         except KeyboardInterrupt:
             logger.info("\n🛑 Shutting down IoT device...")
+            self.flush_sensor_data()
             self.sensors.cleanup()
-            self.mqtt_client.loop_stop()
             self.mqtt_client.disconnect()
 
 if __name__ == "__main__":
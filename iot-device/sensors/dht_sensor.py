@@ -3,17 +3,27 @@ DHT22 Temperature and Humidity Sensor Module
 """
 
 import logging
+import random
+import time
 
 logger = logging.getLogger(__name__)
 
+# Seconds a measurement is reused; the DHT22 needs at least 2s between reads
+DHT_CACHE_TTL = 5.0
+
 class DHTSensor:
     """DHT22 temperature and humidity sensor interface"""
     
-    def __init__(self, gpio_pin: int = 4):
+    def __init__(self, gpio_pin: int = 4, rng: random.Random = None):
         """Initialize DHT22 sensor"""
         self.gpio_pin = gpio_pin
+        self.rng = rng or random.Random()  # Mock data source
         self.dht_available = False
         
+        # Last hardware measurement and when it was taken
+        self.last_reading = None
+        self.last_read_at = 0.0
+        
         try:
             import adafruit_dht
             import board
@@ -34,43 +44,51 @@ class DHTSensor:
             logger.warning("⚠️ adafruit_dht not available - using mock mode")
         except Exception as e:
             logger.error(f"Failed to initialize DHT22 sensor: {e}")
+        
+        # Without hardware, bind the mock reader once so reads skip the availability check
+        if not self.dht_available:
+            self.read_both = self._read_both_mock
+    
+    def read_both(self) -> tuple:
+        """Read temperature in Celsius and humidity percentage, reusing a recent measurement"""
+        now = time.monotonic()
+        if self.last_reading is not None and now - self.last_read_at < DHT_CACHE_TTL:
+            return self.last_reading
+        
+        self.last_reading = self._measure()
+        self.last_read_at = now
+        return self.last_reading
+    
+    def _measure(self) -> tuple:
+        """Read temperature in Celsius and humidity percentage from one measurement"""
+        try:
+            # One 40-bit frame carries both values; the second property
+            # access reuses the measurement instead of triggering another
+            self.dht.measure()
+            temp = self.dht.temperature
+            humidity = self.dht.humidity
+            return (
+                temp if temp is not None else 22.0,  # Default
+                humidity if humidity is not None else 45.0  # Default
+            )
+        except RuntimeError:
+            # DHT sensors occasionally fail to read
+            return 22.0, 45.0
+        except Exception as e:
+            logger.error(f"Error reading DHT22 sensor: {e}")
+            return 22.0, 45.0
+    
+    def _read_both_mock(self) -> tuple:
+        """Mock temperature and humidity readings"""
+        return self.rng.uniform(18.0, 28.0), self.rng.uniform(30.0, 70.0)
     
     def read_temperature(self) -> float:
         """Read temperature in Celsius"""
-        if self.dht_available:
-            try:
-                temp = self.dht.temperature
-                if temp is not None:
-                    return round(temp, 1)
-                return 22.0  # Default
-            except RuntimeError:
-                # DHT sensors occasionally fail to read
-                return 22.0
-            except Exception as e:
-                logger.error(f"Error reading temperature: {e}")
-                return 22.0
-        else:
-            # Mock data
-            import random
-            return round(random.uniform(18.0, 28.0), 1)
+        return self.read_both()[0]
     
     def read_humidity(self) -> float:
         """Read humidity percentage"""
-        if self.dht_available:
-            try:
-                humidity = self.dht.humidity
-                if humidity is not None:
-                    return round(humidity, 1)
-                return 45.0  # Default
-            except RuntimeError:
-                return 45.0
-            except Exception as e:
-                logger.error(f"Error reading humidity: {e}")
-                return 45.0
-        else:
-            # Mock data
-            import random
-            return round(random.uniform(30.0, 70.0), 1)
+        return self.read_both()[1]
     
     def cleanup(self):
         """Clean up sensor resources"""
@@ -4,17 +4,27 @@ Measures ambient light level in lux
 """
 
 import logging
+import random
+import time
 
 logger = logging.getLogger(__name__)
 
+# Seconds a lux reading is reused before the I2C bus is read again
+LUX_CACHE_TTL = 2.0
+
 class LightSensor:
     """TSL2561 light sensor interface"""
     
-    def __init__(self, i2c_address: int = 0x39):
+    def __init__(self, i2c_address: int = 0x39, rng: random.Random = None):
         """Initialize TSL2561 light sensor"""
         self.i2c_address = i2c_address
+        self.rng = rng or random.Random()  # Mock data source
         self.sensor_available = False
         
+        # Last hardware reading and when it was taken
+        self.last_lux = None
+        self.last_read_at = 0.0
+        
         try:
             import board
             import adafruit_tsl2561
@@ -27,22 +37,35 @@ class LightSensor:
             logger.warning("⚠️ adafruit_tsl2561 not available - using mock mode")
         except Exception as e:
             logger.error(f"Failed to initialize TSL2561 sensor: {e}")
+        
+        # Without hardware, bind the mock reader once so reads skip the availability check
+        if not self.sensor_available:
+            self.read_lux = self._read_lux_mock
     
     def read_lux(self) -> float:
-        """Read ambient light level in lux"""
-        if self.sensor_available:
-            try:
-                lux = self.sensor.lux
-                if lux is not None:
-                    return round(lux, 2)
-                return 250.0  # Default
-            except Exception as e:
-                logger.error(f"Error reading light sensor: {e}")
-                return 250.0
-        else:
-            # Mock data
-            import random
-            return round(random.uniform(50.0, 500.0), 2)
+        """Read ambient light level in lux, reusing a recent reading"""
+        now = time.monotonic()
+        if self.last_lux is not None and now - self.last_read_at < LUX_CACHE_TTL:
+            return self.last_lux
+        
+        self.last_lux = self._measure_lux()
+        self.last_read_at = now
+        return self.last_lux
+    
+    def _measure_lux(self) -> float:
+        """Read ambient light level in lux from the I2C bus"""
+        try:
+            lux = self.sensor.lux
+            if lux is not None:
+                return lux
+            return 250.0  # Default
+        except Exception as e:
+            logger.error(f"Error reading light sensor: {e}")
+            return 250.0
+    
+    def _read_lux_mock(self) -> float:
+        """Mock ambient light level in lux"""
+        return self.rng.uniform(50.0, 500.0)
     
     def cleanup(self):
         """Clean up sensor resources"""
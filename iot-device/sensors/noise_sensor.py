@@ -4,81 +4,108 @@ Measures ambient sound level using USB microphone
 """
 
 import logging
+import math
+import random
 import numpy as np
 
 logger = logging.getLogger(__name__)
 
+# Audio capture settings for one noise sample
+CHUNK = 1024
+CHANNELS = 1
+RATE = 44100
+RECORD_SECONDS = 0.1
+CHUNKS_PER_SAMPLE = int(RATE / CHUNK * RECORD_SECONDS)
+# Peak amplitude of the first chunk below which the room is treated as silent
+SILENCE_PEAK = 200
+
 class NoiseSensor:
     """USB microphone noise level sensor"""
     
-    def __init__(self, device_index: int = None):
+    def __init__(self, device_index: int = None, rng: random.Random = None):
         """Initialize noise sensor"""
         self.device_index = device_index
+        self.rng = rng or random.Random()  # Mock data source
         self.audio_available = False
         
+        # Reused capture buffer for one sample of 16-bit frames
+        self.frame_buffer = bytearray(CHUNK * CHUNKS_PER_SAMPLE * 2)
+        
         try:
             import pyaudio
             self.pyaudio = pyaudio
             self.audio = pyaudio.PyAudio()
+            
+            # Open the input stream once; it only runs while a sample is captured
+            self.stream = self.audio.open(
+                format=pyaudio.paInt16,
+                channels=CHANNELS,
+                rate=RATE,
+                input=True,
+                frames_per_buffer=CHUNK,
+                input_device_index=self.device_index,
+                start=False
+            )
             self.audio_available = True
             logger.info("✅ Noise sensor initialized")
         except ImportError:
             logger.warning("⚠️ PyAudio not available - using mock mode")
         except Exception as e:
             logger.error(f"Failed to initialize noise sensor: {e}")
+        
+        # Without hardware, bind the mock reader once so reads skip the availability check
+        if not self.audio_available:
+            self.read_db = self._read_db_mock
     
     def read_db(self) -> float:
         """Read ambient noise level in decibels"""
-        if self.audio_available:
+        try:
+            # Record a short audio sample; the stream is stopped between
+            # samples so reads never return audio buffered since the last one
+            self.stream.start_stream()
+            chunk_bytes = CHUNK * 2
+            frames = memoryview(self.frame_buffer)
             try:
-                # Record a short audio sample
-                CHUNK = 1024
-                FORMAT = self.pyaudio.paInt16
-                CHANNELS = 1
-                RATE = 44100
-                RECORD_SECONDS = 0.1
-                
-                stream = self.audio.open(
-                    format=FORMAT,
-                    channels=CHANNELS,
-                    rate=RATE,
-                    input=True,
-                    frames_per_buffer=CHUNK,
-                    input_device_index=self.device_index
-                )
-                
-                frames = []
-                for _ in range(int(RATE / CHUNK * RECORD_SECONDS)):
-                    data = stream.read(CHUNK, exception_on_overflow=False)
-                    frames.append(data)
+                frames[:chunk_bytes] = self.stream.read(CHUNK, exception_on_overflow=False)
                 
-                stream.stop_stream()
-                stream.close()
+                # A quiet first chunk means a silent room; skip the rest of the capture
+                first_chunk = np.frombuffer(self.frame_buffer, dtype=np.int16, count=CHUNK)
+                if np.abs(first_chunk.astype(np.int32)).max() < SILENCE_PEAK:
+                    return 30.0  # Silent
                 
-                # Convert to numpy array
-                audio_data = np.frombuffer(b''.join(frames), dtype=np.int16)
-                
-                # Calculate RMS (Root Mean Square)
-                rms = np.sqrt(np.mean(audio_data**2))
-                
-                # Convert to decibels (approximate)
-                if rms > 0:
-                    db = 20 * np.log10(rms) - 90  # Calibration offset
-                    return round(max(0, min(120, db)), 2)  # Clamp between 0-120 dB
-                return 30.0  # Silent
-                
-            except Exception as e:
-                logger.error(f"Error reading noise sensor: {e}")
-                return 40.0  # Default
-        else:
-            # Mock data
-            import random
-            return round(random.uniform(30.0, 80.0), 2)
+                for i in range(1, CHUNKS_PER_SAMPLE):
+                    data = self.stream.read(CHUNK, exception_on_overflow=False)
+                    frames[i * chunk_bytes:(i + 1) * chunk_bytes] = data
+            finally:
+                self.stream.stop_stream()
+            
+            # View the capture buffer as samples without copying
+            audio_data = np.frombuffer(self.frame_buffer, dtype=np.int16)
+            
+            # Calculate RMS (Root Mean Square) with a single dot product;
+            # float64 avoids the int16 overflow of squaring samples in place
+            samples = audio_data.astype(np.float64)
+            rms = math.sqrt(np.dot(samples, samples) / samples.size)
+            
+            # Convert to decibels (approximate)
+            if rms > 0:
+                db = 20 * math.log10(rms) - 90  # Calibration offset
+                return max(0.0, min(120.0, db))  # Clamp between 0-120 dB
+            return 30.0  # Silent
+            
+        except Exception as e:
+            logger.error(f"Error reading noise sensor: {e}")
+            return 40.0  # Default
+    
+    def _read_db_mock(self) -> float:
+        """Mock ambient noise level in decibels"""
+        return self.rng.uniform(30.0, 80.0)
     
     def cleanup(self):
         """Clean up audio resources"""
         if self.audio_available:
             try:
+                self.stream.close()
                 self.audio.terminate()
                 logger.info("🧹 Noise sensor cleaned up")
             except Exception as e:
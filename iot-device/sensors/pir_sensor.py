@@ -4,17 +4,23 @@ Detects motion using HC-SR501 PIR sensor
 """
 
 import logging
+import random
 
 logger = logging.getLogger(__name__)
 
 class PIRSensor:
     """PIR motion sensor interface"""
     
-    def __init__(self, gpio_pin: int = 17):
+    def __init__(self, gpio_pin: int = 17, rng: random.Random = None):
         """Initialize PIR sensor"""
         self.gpio_pin = gpio_pin
+        self.rng = rng or random.Random()  # Mock data source
         self.gpio_available = False
         
+        # Motion state kept current by GPIO edge callbacks
+        self.motion_active = False
+        self.motion_latched = False
+        
         try:
             import RPi.GPIO as GPIO
             self.GPIO = GPIO
@@ -22,23 +28,45 @@ class PIRSensor:
             self.GPIO.setup(self.gpio_pin, GPIO.IN)
             self.gpio_available = True
             logger.info(f"✅ PIR sensor initialized on GPIO {self.gpio_pin}")
+            
+            # Track motion from pin edges so reads catch motion between polls
+            try:
+                self.GPIO.add_event_detect(self.gpio_pin, GPIO.BOTH, callback=self._on_edge)
+                self.motion_active = bool(self.GPIO.input(self.gpio_pin))
+                self.read = self._read_latched
+            except RuntimeError as e:
+                logger.warning(f"⚠️ PIR edge detection unavailable - polling instead: {e}")
         except ImportError:
             logger.warning("⚠️ RPi.GPIO not available - using mock mode")
         except Exception as e:
             logger.error(f"Failed to initialize PIR sensor: {e}")
+        
+        # Without hardware, bind the mock reader once so reads skip the availability check
+        if not self.gpio_available:
+            self.read = self._read_mock
     
     def read(self) -> bool:
         """Read motion detection state"""
-        if self.gpio_available:
-            try:
-                return bool(self.GPIO.input(self.gpio_pin))
-            except Exception as e:
-                logger.error(f"Error reading PIR sensor: {e}")
-                return False
-        else:
-            # Mock data for testing without hardware
-            import random
-            return random.choice([True, False])
+        try:
+            return bool(self.GPIO.input(self.gpio_pin))
+        except Exception as e:
+            logger.error(f"Error reading PIR sensor: {e}")
+            return False
+    
+    def _on_edge(self, channel):
+        """Record the pin level on every edge and latch any rising edge"""
+        self.motion_active = bool(self.GPIO.input(channel))
+        if self.motion_active:
+            self.motion_latched = True
+    
+    def _read_latched(self) -> bool:
+        """Report motion seen since the last read, clearing the latch"""
+        motion, self.motion_latched = self.motion_latched or self.motion_active, False
+        return motion
+    
+    def _read_mock(self) -> bool:
+        """Mock motion detection state for testing without hardware"""
+        return self.rng.choice([True, False])
     
     def cleanup(self):
         """Clean up GPIO resources"""
@@ -4,14 +4,68 @@ Aggregates all sensor readings into a single interface
 """
 
 import logging
+import random
+import time
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
 from .pir_sensor import PIRSensor
 from .dht_sensor import DHTSensor
 from .light_sensor import LightSensor
 from .noise_sensor import NoiseSensor
-from datetime import datetime
 
 logger = logging.getLogger(__name__)
 
+# Mock ranges for temperature, humidity, light and noise, drawn in one call when no hardware is present
+MOCK_LOWS = np.array([18.0, 30.0, 50.0, 30.0])
+MOCK_HIGHS = np.array([28.0, 70.0, 500.0, 80.0])
+
+# Environment score thresholds and the penalty for each bucket between them;
+# upper bounds sit one ulp above the limit so a reading on a limit stays in range
+NOISE_THRESHOLDS = np.array([np.nextafter(60.0, np.inf), np.nextafter(70.0, np.inf)])
+NOISE_PENALTIES = np.array([0, 15, 30])
+LIGHT_THRESHOLDS = np.array([200.0, np.nextafter(1000.0, np.inf)])
+LIGHT_PENALTIES = np.array([20, 0, 10])
+TEMPERATURE_THRESHOLDS = np.array([18.0, 20.0, np.nextafter(26.0, np.inf), np.nextafter(28.0, np.inf)])
+TEMPERATURE_PENALTIES = np.array([25, 10, 0, 10, 25])
+
+# Fixed recommendations, shared by every analysis; treat them as read-only
+HIGH_NOISE_RECOMMENDATION = {
+    'type': 'noise',
+    'severity': 'high',
+    'message': 'Environment is too noisy for focus work',
+    'suggestion': 'Enable noise cancellation or move to quieter space'
+}
+LOW_LIGHT_RECOMMENDATION = {
+    'type': 'lighting',
+    'severity': 'medium',
+    'message': 'Lighting is insufficient',
+    'suggestion': 'Increase ambient lighting or desk lamp'
+}
+EXCESSIVE_LIGHT_RECOMMENDATION = {
+    'type': 'lighting',
+    'severity': 'low',
+    'message': 'Lighting is too bright',
+    'suggestion': 'Reduce screen brightness or close blinds'
+}
+NO_MOTION_RECOMMENDATION = {
+    'type': 'activity',
+    'severity': 'low',
+    'message': 'No movement detected recently',
+    'suggestion': 'Consider taking a short break'
+}
+
+
+def environment_scores(noise_level, light_level, temperature):
+    """Score environment quality (0-100) for scalar readings or arrays of readings"""
+    score = (
+        100
+        - NOISE_PENALTIES[np.searchsorted(NOISE_THRESHOLDS, noise_level, side='right')]
+        - LIGHT_PENALTIES[np.searchsorted(LIGHT_THRESHOLDS, light_level, side='right')]
+        - TEMPERATURE_PENALTIES[np.searchsorted(TEMPERATURE_THRESHOLDS, temperature, side='right')]
+    )
+    return np.clip(score, 0, 100)
+
+
 class SensorManager:
     """Manages all sensors and aggregates readings"""
     
@@ -19,30 +73,61 @@ class SensorManager:
         """Initialize all sensors"""
         logger.info("🔧 Initializing sensor manager...")
         
-        self.pir = PIRSensor(gpio_pin=17)
-        self.dht = DHTSensor(gpio_pin=4)
-        self.light = LightSensor(i2c_address=0x39)
-        self.noise = NoiseSensor()
+        # One random source shared by every sensor's mock mode
+        self.rng = random.Random()
+        
+        self.pir = PIRSensor(gpio_pin=17, rng=self.rng)
+        self.dht = DHTSensor(gpio_pin=4, rng=self.rng)
+        self.light = LightSensor(i2c_address=0x39, rng=self.rng)
+        self.noise = NoiseSensor(rng=self.rng)
+        
+        # With every sensor mocked, readings come from a single vectorized draw
+        self.mock_mode = not (
+            self.pir.gpio_available or self.dht.dht_available or
+            self.light.sensor_available or self.noise.audio_available
+        )
+        self.np_rng = np.random.default_rng()
+        
+        # Hardware reads block on GPIO, I2C and audio, so they run side by side
+        self.pool = ThreadPoolExecutor(max_workers=4, thread_name_prefix="sensor")
         
         logger.info("✅ Sensor manager initialized")
     
-    def read_all(self) -> dict:
-        """Read all sensors and return aggregated data"""
+    def read_all(self, out: dict = None) -> dict:
+        """Read all sensors and return aggregated data, filling `out` in place if given"""
+        data = out if out is not None else {}
+        if self.mock_mode:
+            return self._read_all_mock(data)
         try:
-            data = {
-                'motion_detected': self.pir.read(),
-                'temperature': self.dht.read_temperature(),
-                'humidity': self.dht.read_humidity(),
-                'light_level': self.light.read_lux(),
-                'noise_level': self.noise.read_db(),
-                'timestamp': datetime.utcnow().isoformat()
-            }
+            motion = self.pool.submit(self.pir.read)
+            climate = self.pool.submit(self.dht.read_both)
+            light = self.pool.submit(self.light.read_lux)
+            noise = self.pool.submit(self.noise.read_db)
+            
+            data['motion_detected'] = motion.result()
+            data['temperature'], data['humidity'] = climate.result()
+            data['light_level'] = light.result()
+            data['noise_level'] = noise.result()
+            data['ts'] = int(time.time() * 1000)  # Epoch milliseconds
             
             logger.debug(f"📊 Sensor readings: {data}")
-            return data
         except Exception as e:
             logger.error(f"Error reading sensors: {e}")
-            return self._get_default_readings()
+            data.update(self._get_default_readings())
+        return data
+    
+    def _read_all_mock(self, data: dict) -> dict:
+        """Fill mock readings for all sensors from one vectorized draw"""
+        values = self.np_rng.uniform(MOCK_LOWS, MOCK_HIGHS)
+        temperature, humidity, light_level, noise_level = values.tolist()
+        
+        data['motion_detected'] = bool(self.np_rng.integers(2))
+        data['temperature'] = temperature
+        data['humidity'] = humidity
+        data['light_level'] = light_level
+        data['noise_level'] = noise_level
+        data['ts'] = int(time.time() * 1000)  # Epoch milliseconds
+        return data
     
     def _get_default_readings(self) -> dict:
         """Return default readings in case of error"""
@@ -52,12 +137,13 @@ class SensorManager:
             'humidity': 45.0,
             'light_level': 250.0,
             'noise_level': 40.0,
-            'timestamp': datetime.utcnow().isoformat()
+            'ts': int(time.time() * 1000)
         }
     
-    def analyze_environment(self) -> dict:
-        """Analyze environment and provide recommendations"""
-        data = self.read_all()
+    def analyze_environment(self, data: dict = None) -> dict:
+        """Analyze environment and provide recommendations, reading sensors unless `data` is given"""
+        if data is None:
+            data = self.read_all()
         
         recommendations = []
         issues = []
@@ -65,30 +151,15 @@ class SensorManager:
         # Check noise level
         if data['noise_level'] > 70:
             issues.append("high_noise")
-            recommendations.append({
-                'type': 'noise',
-                'severity': 'high',
-                'message': 'Environment is too noisy for focus work',
-                'suggestion': 'Enable noise cancellation or move to quieter space'
-            })
+            recommendations.append(HIGH_NOISE_RECOMMENDATION)
         
         # Check lighting
         if data['light_level'] < 200:
             issues.append("low_light")
-            recommendations.append({
-                'type': 'lighting',
-                'severity': 'medium',
-                'message': 'Lighting is insufficient',
-                'suggestion': 'Increase ambient lighting or desk lamp'
-            })
+            recommendations.append(LOW_LIGHT_RECOMMENDATION)
         elif data['light_level'] > 1000:
             issues.append("excessive_light")
-            recommendations.append({
-                'type': 'lighting',
-                'severity': 'low',
-                'message': 'Lighting is too bright',
-                'suggestion': 'Reduce screen brightness or close blinds'
-            })
+            recommendations.append(EXCESSIVE_LIGHT_RECOMMENDATION)
         
         # Check temperature
         if data['temperature'] < 18 or data['temperature'] > 28:
@@ -96,18 +167,13 @@ class SensorManager:
             recommendations.append({
                 'type': 'temperature',
                 'severity': 'medium',
-                'message': f"Temperature is {data['temperature']}°C (uncomfortable)",
+                'message': f"Temperature is {data['temperature']:.1f}°C (uncomfortable)",
                 'suggestion': 'Adjust room temperature to 20-26°C range'
             })
         
         # Check motion (for break reminders)
         if not data['motion_detected']:
-            recommendations.append({
-                'type': 'activity',
-                'severity': 'low',
-                'message': 'No movement detected recently',
-                'suggestion': 'Consider taking a short break'
-            })
+            recommendations.append(NO_MOTION_RECOMMENDATION)
         
         return {
             'sensor_data': data,
@@ -118,27 +184,7 @@ class SensorManager:
     
     def _calculate_environment_score(self, data: dict) -> int:
         """Calculate environment quality score (0-100)"""
-        score = 100
-        
-        # Penalize for noise
-        if data['noise_level'] > 70:
-            score -= 30
-        elif data['noise_level'] > 60:
-            score -= 15
-        
-        # Penalize for poor lighting
-        if data['light_level'] < 200:
-            score -= 20
-        elif data['light_level'] > 1000:
-            score -= 10
-        
-        # Penalize for uncomfortable temperature
-        if data['temperature'] < 18 or data['temperature'] > 28:
-            score -= 25
-        elif data['temperature'] < 20 or data['temperature'] > 26:
-            score -= 10
-        
-        return max(0, min(100, score))
+        return int(environment_scores(data['noise_level'], data['light_level'], data['temperature']))
     
     def cleanup(self):
         """Clean up all sensor resources"""
@@ -147,4 +193,5 @@ class SensorManager:
         self.dht.cleanup()
         self.light.cleanup()
         self.noise.cleanup()
+        self.pool.shutdown(wait=True)
         logger.info("✅ Sensors cleaned up")
@@ -7,19 +7,160 @@ for every file, function, class, and component in the project.
 """
 
 import os
+import sys
 import ast
 import json
 import re
+import argparse
+import asyncio
+import multiprocessing
+from collections import defaultdict
+from itertools import islice
 from pathlib import Path
-from typing import Dict, List, Any
+from typing import Dict, List, Any, Iterator, Optional, Tuple
 from datetime import datetime
 
+try:
+    # Native JavaScript/JSX parser; the regex patterns below are the fallback
+    import tree_sitter_javascript
+    from tree_sitter import Language, Parser
+    JS_PARSER = Parser(Language(tree_sitter_javascript.language()))
+except (ImportError, TypeError):
+    JS_PARSER = None
+
+try:
+    import orjson  # Faster JSON parsing and cache load/save when installed
+    json_loads = orjson.loads
+except ImportError:
+    orjson = None
+    json_loads = json.loads
+
+try:
+    from tqdm import tqdm  # Progress bar while files are analyzed
+except ImportError:
+    tqdm = None
+
+try:
+    import aiofiles  # Native async file reads for --async-io when installed
+except ImportError:
+    aiofiles = None
+
+# File suffix -> file type, matched in a single walk of the project
+SOURCE_SUFFIXES = {
+    '.py': 'python',
+    '.js': 'javascript',
+    '.jsx': 'javascript',
+    '.json': 'json',
+    '.yml': 'yaml',
+    '.yaml': 'yaml'
+}
+
+# Directories that are never descended into
+EXCLUDE_DIRS = {'node_modules', '__pycache__', '.git', 'build', 'dist', '.pytest_cache'}
+
+# JavaScript patterns for imports, React components, useState hooks and exports,
+# used when tree-sitter is not installed
+JS_IMPORT_RE = re.compile(r'import\s+(?:{([^}]+)}|(\w+))\s+from\s+[\'"]([^\'"]+)[\'"]')
+JS_COMPONENT_RE = re.compile(r'(?:export\s+)?(?:const|function)\s+(\w+)\s*=?\s*\(([^)]*)\)\s*(?:=>|{)')
+JS_HOOK_RE = re.compile(r'const\s+\[(\w+),\s*set\w+\]\s*=\s*useState')
+JS_EXPORT_RE = re.compile(r'export\s+(?:default\s+)?(?:const|function|class)?\s+(\w+)')
+
+# Files handed to each worker process at a time
+ANALYZE_CHUNKSIZE = 16
+
+# With --async-io, this many files are read concurrently ahead of parsing
+READ_BATCH_SIZE = 64
+
+# Without tqdm, progress is printed once per this many analyzed files
+PROGRESS_INTERVAL = 100
+
+# Per-file analysis from the previous run, keyed by path, mtime and size
+CACHE_FILE = '.doc_cache.json'
+# Cached analysis is only valid for the analyzer that produced it
+ANALYZER_SIGNATURE = f"{os.stat(__file__).st_mtime_ns}:{JS_PARSER is not None}"
+
+# Files never analyzed: lockfiles are large and carry nothing worth documenting
+EXCLUDE_FILES = {'package-lock.json', 'yarn.lock', CACHE_FILE}
+
+
+def _node_name(node) -> str:
+    """Get name from AST node, interned since the same type names recur across files"""
+    handler = NAME_HANDLERS.get(type(node))
+    if handler is not None:
+        return sys.intern(handler(node))
+    return sys.intern(ast.unparse(node) if hasattr(ast, 'unparse') else str(node))
+
+
+def _raw_docstring(node) -> str:
+    """Docstring of a module, class or function as written, without inspect.cleandoc"""
+    body = getattr(node, 'body', None)
+    if body and isinstance(body[0], ast.Expr):
+        value = body[0].value
+        if isinstance(value, ast.Constant) and isinstance(value.value, str):
+            return value.value.strip()
+    return ""
+
+
+# AST node type -> name builder for the common annotation and decorator shapes
+NAME_HANDLERS = {
+    ast.Name: lambda node: node.id,
+    ast.Attribute: lambda node: f"{_node_name(node.value)}.{node.attr}",
+    ast.Subscript: lambda node: f"{_node_name(node.value)}[{_node_name(node.slice)}]",
+    ast.Constant: lambda node: str(node.value)
+}
+
+
+def _param_names(func: Dict[str, Any]) -> str:
+    """Comma-separated parameter names of an analyzed function"""
+    return ', '.join(p['name'] for p in func.get('parameters', []))
+
+
+async def _read_file(filepath: Path) -> bytes:
+    """Read a whole file without blocking the event loop"""
+    if aiofiles is not None:
+        async with aiofiles.open(filepath, 'rb') as f:
+            return await f.read()
+    return await asyncio.to_thread(filepath.read_bytes)
+
+
+async def _read_all(paths: List[Path]) -> List[Any]:
+    """Read files concurrently; a failed read comes back as its exception"""
+    return await asyncio.gather(*(_read_file(path) for path in paths), return_exceptions=True)
+
+
+def _prefetch(tasks: List[Tuple]) -> Iterator[Tuple]:
+    """Yield analysis tasks with their file contents, read in concurrent batches"""
+    for start in range(0, len(tasks), READ_BATCH_SIZE):
+        batch = tasks[start:start + READ_BATCH_SIZE]
+        contents = asyncio.run(_read_all([task[1] for task in batch]))
+        for task, content in zip(batch, contents):
+            # Unread files are left to the analyzer, which records the error
+            yield task[:4] + (None if isinstance(content, BaseException) else content,)
+
+
+def _analyze_one(task: Tuple[str, Path, str, str, Optional[bytes]]) -> Tuple[str, str, Optional[Dict[str, Any]]]:
+    """Analyze one file in a worker process; returns no data for unsupported types"""
+    project_root, filepath, rel_path, file_type, content = task
+    analyzer = CodeAnalyzer(project_root)
+    
+    if file_type == 'python':
+        file_data = analyzer.analyze_python_file(filepath, rel_path, content)
+    elif file_type == 'javascript':
+        file_data = analyzer.analyze_javascript_file(filepath, rel_path, content)
+    elif file_type == 'json':
+        file_data = analyzer.analyze_json_file(filepath, rel_path, content)
+    else:
+        file_data = None
+    return rel_path, file_type, file_data
+
 
 class CodeAnalyzer:
     """Analyzes Python and JavaScript code to extract structure and documentation"""
     
-    def __init__(self, project_root: str):
+    def __init__(self, project_root: str, use_cache: bool = False):
         self.project_root = Path(project_root)
+        self.use_cache = use_cache
+        self.cache = self._load_cache() if use_cache else {}
         self.documentation = {
             "project_name": "Privacy-Focused Context-Aware Digital Wellbeing System",
             "version": "1.0.0",
@@ -33,19 +174,25 @@ class CodeAnalyzer:
             "configs": {}
         }
     
-    def analyze_python_file(self, filepath: Path) -> Dict[str, Any]:
+    def analyze_python_file(self, filepath: Path, rel_path: Optional[str] = None,
+                            source: Optional[bytes] = None) -> Dict[str, Any]:
         """Analyze a Python file and extract all functions, classes, and docstrings"""
+        if rel_path is None:
+            rel_path = str(filepath.relative_to(self.project_root))
         try:
-            with open(filepath, 'r', encoding='utf-8') as f:
-                content = f.read()
+            # ast.parse decodes the source itself, honouring encoding declarations
+            if source is None:
+                with open(filepath, 'rb') as f:
+                    source = f.read()
+            content = source
             
-            tree = ast.parse(content)
+            tree = ast.parse(content, filename=str(filepath))
             
             file_info = {
-                "path": str(filepath.relative_to(self.project_root)),
+                "path": rel_path,
                 "type": "python",
-                "lines": len(content.splitlines()),
-                "docstring": ast.get_docstring(tree) or "",
+                "lines": content.count(b'\n') + (1 if content and not content.endswith(b'\n') else 0),
+                "docstring": _raw_docstring(tree),
                 "imports": [],
                 "classes": [],
                 "functions": [],
@@ -53,30 +200,23 @@ class CodeAnalyzer:
                 "decorators": []
             }
             
-            # Extract imports
-            for node in ast.walk(tree):
-                if isinstance(node, ast.Import):
-                    for alias in node.names:
-                        file_info["imports"].append({
-                            "name": alias.name,
-                            "alias": alias.asname
-                        })
-                elif isinstance(node, ast.ImportFrom):
-                    module = node.module or ""
-                    for alias in node.names:
-                        file_info["imports"].append({
-                            "from": module,
-                            "name": alias.name,
-                            "alias": alias.asname
-                        })
-            
-            # Extract classes
+            # Extract imports, classes, functions and constants in one pass
+            # over module-level statements
             for node in ast.iter_child_nodes(tree):
-                if isinstance(node, ast.ClassDef):
+                if isinstance(node, (ast.Import, ast.ImportFrom)):
+                    self._add_imports(node, file_info["imports"])
+                
+                # Optional imports guarded by try/if blocks
+                elif isinstance(node, (ast.Try, ast.If)):
+                    for child in ast.walk(node):
+                        if isinstance(child, (ast.Import, ast.ImportFrom)):
+                            self._add_imports(child, file_info["imports"])
+                
+                elif isinstance(node, ast.ClassDef):
                     class_info = {
                         "name": node.name,
                         "lineno": node.lineno,
-                        "docstring": ast.get_docstring(node) or "",
+                        "docstring": _raw_docstring(node),
                         "bases": [self._get_name(base) for base in node.bases],
                         "decorators": [self._get_name(dec) for dec in node.decorator_list],
                         "methods": []
@@ -84,14 +224,14 @@ class CodeAnalyzer:
                     
                     # Extract methods
                     for item in node.body:
-                        if isinstance(item, ast.FunctionDef):
+                        if isinstance(item, (ast.FunctionDef, ast.AsyncFunctionDef)):
                             method_info = self._analyze_function(item)
                             class_info["methods"].append(method_info)
                     
                     file_info["classes"].append(class_info)
                 
                 # Extract top-level functions
-                elif isinstance(node, ast.FunctionDef):
+                elif isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
                     func_info = self._analyze_function(node)
                     file_info["functions"].append(func_info)
                 
@@ -108,17 +248,34 @@ class CodeAnalyzer:
             
         except Exception as e:
             return {
-                "path": str(filepath.relative_to(self.project_root)),
+                "path": rel_path,
                 "error": str(e),
                 "type": "python"
             }
     
+    def _add_imports(self, node, imports: List[Dict[str, Any]]):
+        """Append the names imported by an Import or ImportFrom node"""
+        if isinstance(node, ast.Import):
+            for alias in node.names:
+                imports.append({
+                    "name": alias.name,
+                    "alias": alias.asname
+                })
+        else:
+            module = node.module or ""
+            for alias in node.names:
+                imports.append({
+                    "from": module,
+                    "name": alias.name,
+                    "alias": alias.asname
+                })
+    
     def _analyze_function(self, node: ast.FunctionDef) -> Dict[str, Any]:
         """Analyze a function node"""
         func_info = {
             "name": node.name,
             "lineno": node.lineno,
-            "docstring": ast.get_docstring(node) or "",
+            "docstring": _raw_docstring(node),
             "decorators": [self._get_name(dec) for dec in node.decorator_list],
             "parameters": [],
             "returns": None,
@@ -140,26 +297,25 @@ class CodeAnalyzer:
     
     def _get_name(self, node) -> str:
         """Get name from AST node"""
-        if isinstance(node, ast.Name):
-            return node.id
-        elif isinstance(node, ast.Attribute):
-            return f"{self._get_name(node.value)}.{node.attr}"
-        elif isinstance(node, ast.Subscript):
-            return f"{self._get_name(node.value)}[{self._get_name(node.slice)}]"
-        elif isinstance(node, ast.Constant):
-            return str(node.value)
-        return ast.unparse(node) if hasattr(ast, 'unparse') else str(node)
-    
-    def analyze_javascript_file(self, filepath: Path) -> Dict[str, Any]:
+        return _node_name(node)
+    
+    def analyze_javascript_file(self, filepath: Path, rel_path: Optional[str] = None,
+                                source: Optional[bytes] = None) -> Dict[str, Any]:
         """Analyze a JavaScript/JSX file"""
+        if rel_path is None:
+            rel_path = str(filepath.relative_to(self.project_root))
         try:
-            with open(filepath, 'r', encoding='utf-8') as f:
-                content = f.read()
+            if source is None:
+                with open(filepath, 'r', encoding='utf-8') as f:
+                    content = f.read()
+            else:
+                # Same newline translation as reading in text mode
+                content = source.decode('utf-8').replace('\r\n', '\n').replace('\r', '\n')
             
             file_info = {
-                "path": str(filepath.relative_to(self.project_root)),
+                "path": rel_path,
                 "type": "javascript",
-                "lines": len(content.splitlines()),
+                "lines": content.count('\n') + (1 if content and not content.endswith('\n') else 0),
                 "imports": [],
                 "exports": [],
                 "components": [],
@@ -167,160 +323,386 @@ class CodeAnalyzer:
                 "hooks": []
             }
             
-            # Extract imports
-            import_pattern = r'import\s+(?:{([^}]+)}|(\w+))\s+from\s+[\'"]([^\'"]+)[\'"]'
-            for match in re.finditer(import_pattern, content):
-                if match.group(1):  # Named imports
-                    imports = [i.strip() for i in match.group(1).split(',')]
-                    file_info["imports"].append({
-                        "type": "named",
-                        "names": imports,
-                        "from": match.group(3)
-                    })
-                elif match.group(2):  # Default import
-                    file_info["imports"].append({
-                        "type": "default",
-                        "name": match.group(2),
-                        "from": match.group(3)
-                    })
-            
-            # Extract React components
-            component_pattern = r'(?:export\s+)?(?:const|function)\s+(\w+)\s*=?\s*\(([^)]*)\)\s*(?:=>|{)'
-            for match in re.finditer(component_pattern, content):
-                name = match.group(1)
-                if name[0].isupper():  # React components start with uppercase
-                    file_info["components"].append({
-                        "name": name,
-                        "props": match.group(2).strip()
-                    })
-            
-            # Extract hooks
-            hook_pattern = r'const\s+\[(\w+),\s*set\w+\]\s*=\s*useState'
-            for match in re.finditer(hook_pattern, content):
-                file_info["hooks"].append({
-                    "type": "useState",
-                    "state": match.group(1)
-                })
-            
-            # Extract useEffect
-            if 'useEffect' in content:
-                effect_count = content.count('useEffect(')
-                file_info["hooks"].append({
-                    "type": "useEffect",
-                    "count": effect_count
-                })
-            
-            # Extract exports
-            export_pattern = r'export\s+(?:default\s+)?(?:const|function|class)?\s+(\w+)'
-            for match in re.finditer(export_pattern, content):
-                file_info["exports"].append(match.group(1))
-            
+            if JS_PARSER is not None:
+                self._extract_javascript_tree(content, file_info)
+            else:
+                self._extract_javascript_regex(content, file_info)
             return file_info
             
         except Exception as e:
             return {
-                "path": str(filepath.relative_to(self.project_root)),
+                "path": rel_path,
                 "error": str(e),
                 "type": "javascript"
             }
     
-    def analyze_json_file(self, filepath: Path) -> Dict[str, Any]:
+    def _extract_javascript_tree(self, content: str, file_info: Dict[str, Any]):
+        """Extract imports, components, hooks and exports from a tree-sitter parse"""
+        tree = JS_PARSER.parse(content.encode('utf-8'))
+        effect_count = 0
+        
+        # Depth-first walk in source order
+        stack = [tree.root_node]
+        while stack:
+            node = stack.pop()
+            node_type = node.type
+            
+            if node_type == 'import_statement':
+                self._add_js_import(node, file_info["imports"])
+                continue
+            
+            if node_type == 'export_statement':
+                file_info["exports"].extend(self._js_export_names(node))
+            
+            elif node_type == 'function_declaration':
+                name = node.child_by_field_name('name')
+                if name is not None and name.text[:1].isupper():  # React components start with uppercase
+                    file_info["components"].append({
+                        "name": name.text.decode(),
+                        "props": self._js_params(node)
+                    })
+            
+            elif node_type == 'variable_declarator':
+                name = node.child_by_field_name('name')
+                value = node.child_by_field_name('value')
+                if name is None or value is None:
+                    pass
+                elif name.type == 'identifier' and value.type in ('arrow_function', 'function_expression'):
+                    if name.text[:1].isupper():
+                        file_info["components"].append({
+                            "name": name.text.decode(),
+                            "props": self._js_params(value)
+                        })
+                elif name.type == 'array_pattern' and value.type == 'call_expression':
+                    callee = value.child_by_field_name('function')
+                    state = name.named_children[0] if name.named_children else None
+                    if callee is not None and callee.text in (b'useState', b'React.useState') and state is not None:
+                        file_info["hooks"].append({
+                            "type": "useState",
+                            "state": state.text.decode()
+                        })
+            
+            elif node_type == 'call_expression':
+                callee = node.child_by_field_name('function')
+                if callee is not None and callee.text in (b'useEffect', b'React.useEffect'):
+                    effect_count += 1
+            
+            stack.extend(reversed(node.named_children))
+        
+        if effect_count:
+            file_info["hooks"].append({
+                "type": "useEffect",
+                "count": effect_count
+            })
+    
+    def _add_js_import(self, node, imports: List[Dict[str, Any]]):
+        """Append the default and named imports of an import statement"""
+        source = node.child_by_field_name('source')
+        if source is None:
+            return
+        module = source.text.decode()[1:-1]
+        
+        for clause in node.named_children:
+            if clause.type != 'import_clause':
+                continue
+            for child in clause.named_children:
+                if child.type == 'identifier':
+                    imports.append({
+                        "type": "default",
+                        "name": child.text.decode(),
+                        "from": module
+                    })
+                elif child.type == 'named_imports':
+                    imports.append({
+                        "type": "named",
+                        "names": [spec.text.decode() for spec in child.named_children if spec.type == 'import_specifier'],
+                        "from": module
+                    })
+    
+    def _js_export_names(self, node) -> List[str]:
+        """Names exported by an export statement"""
+        declaration = node.child_by_field_name('declaration')
+        if declaration is not None:
+            if declaration.type in ('lexical_declaration', 'variable_declaration'):
+                names = [child.child_by_field_name('name') for child in declaration.named_children]
+                return [name.text.decode() for name in names if name is not None and name.type == 'identifier']
+            name = declaration.child_by_field_name('name')
+            return [name.text.decode()] if name is not None else []
+        
+        value = node.child_by_field_name('value')
+        if value is not None and value.type == 'identifier':
+            return [value.text.decode()]
+        
+        names = []
+        for clause in node.named_children:
+            if clause.type == 'export_clause':
+                for spec in clause.named_children:
+                    name = spec.child_by_field_name('alias') or spec.child_by_field_name('name')
+                    if name is not None:
+                        names.append(name.text.decode())
+        return names
+    
+    def _js_params(self, node) -> str:
+        """Parameter list of a function node, without the parentheses"""
+        params = node.child_by_field_name('parameters')
+        if params is not None:
+            return params.text.decode()[1:-1].strip()
+        param = node.child_by_field_name('parameter')  # Single arrow function parameter
+        return param.text.decode() if param is not None else ""
+    
+    def _extract_javascript_regex(self, content: str, file_info: Dict[str, Any]):
+        """Extract imports, components, hooks and exports with regular expressions"""
+        # Extract imports
+        for match in JS_IMPORT_RE.finditer(content):
+            if match.group(1):  # Named imports
+                imports = [i.strip() for i in match.group(1).split(',')]
+                file_info["imports"].append({
+                    "type": "named",
+                    "names": imports,
+                    "from": match.group(3)
+                })
+            elif match.group(2):  # Default import
+                file_info["imports"].append({
+                    "type": "default",
+                    "name": match.group(2),
+                    "from": match.group(3)
+                })
+        
+        # Extract React components
+        for match in JS_COMPONENT_RE.finditer(content):
+            name = match.group(1)
+            if name[0].isupper():  # React components start with uppercase
+                file_info["components"].append({
+                    "name": name,
+                    "props": match.group(2).strip()
+                })
+        
+        # Extract hooks
+        for match in JS_HOOK_RE.finditer(content):
+            file_info["hooks"].append({
+                "type": "useState",
+                "state": match.group(1)
+            })
+        
+        # Extract useEffect
+        if 'useEffect' in content:
+            effect_count = content.count('useEffect(')
+            file_info["hooks"].append({
+                "type": "useEffect",
+                "count": effect_count
+            })
+        
+        # Extract exports
+        for match in JS_EXPORT_RE.finditer(content):
+            file_info["exports"].append(match.group(1))
+    
+    def analyze_json_file(self, filepath: Path, rel_path: Optional[str] = None,
+                          source: Optional[bytes] = None) -> Dict[str, Any]:
         """Analyze a JSON configuration file"""
+        if rel_path is None:
+            rel_path = str(filepath.relative_to(self.project_root))
         try:
-            with open(filepath, 'r', encoding='utf-8') as f:
-                content = json.load(f)
+            if source is None:
+                with open(filepath, 'rb') as f:
+                    source = f.read()
+            content = json_loads(source)
             
             return {
-                "path": str(filepath.relative_to(self.project_root)),
+                "path": rel_path,
                 "type": "json",
                 "keys": list(content.keys()) if isinstance(content, dict) else [],
                 "structure": self._get_json_structure(content)
             }
         except Exception as e:
             return {
-                "path": str(filepath.relative_to(self.project_root)),
+                "path": rel_path,
                 "error": str(e),
                 "type": "json"
             }
     
     def _get_json_structure(self, data, depth=0, max_depth=3) -> Any:
         """Get simplified structure of JSON data"""
-        if depth > max_depth:
-            return "..."
-        
-        if isinstance(data, dict):
-            return {k: self._get_json_structure(v, depth+1, max_depth) for k, v in list(data.items())[:10]}
-        elif isinstance(data, list):
-            if len(data) > 0:
-                return [self._get_json_structure(data[0], depth+1, max_depth)]
-            return []
-        else:
-            return type(data).__name__
+        # Worklist of (node, container, slot, depth); each node's summary is
+        # written into its slot in the parent summary
+        root = [None]
+        stack = [(data, root, 0, depth)]
+        while stack:
+            node, parent, slot, depth = stack.pop()
+            if depth > max_depth:
+                parent[slot] = "..."
+            elif isinstance(node, dict):
+                summary = parent[slot] = {}
+                for key, value in islice(node.items(), 10):
+                    summary[key] = None  # Reserve the slot to keep key order
+                    stack.append((value, summary, key, depth + 1))
+            elif isinstance(node, list):
+                summary = parent[slot] = []
+                if node:
+                    summary.append(None)
+                    stack.append((node[0], summary, 0, depth + 1))
+            else:
+                parent[slot] = type(node).__name__
+        return root[0]
+    
+    def _iter_source_files(self) -> Iterator[Tuple[Path, str, str]]:
+        """Yield (path, path relative to the root, file type) for every source file, pruning excluded directories"""
+        # Each directory carries its path relative to the root, so file paths
+        # relative to the root are a string join away
+        stack = [(str(self.project_root), '')]
+        while stack:
+            dirpath, rel_dir = stack.pop()
+            try:
+                with os.scandir(dirpath) as it:
+                    entries = sorted(it, key=lambda entry: entry.name)
+            except OSError:
+                continue
+            
+            subdirs = []
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False):
+                    if entry.name not in EXCLUDE_DIRS:
+                        subdirs.append((entry.path, rel_dir + entry.name + '/'))
+                    continue
+                file_type = SOURCE_SUFFIXES.get(os.path.splitext(entry.name)[1])
+                if file_type and entry.name not in EXCLUDE_FILES:
+                    yield Path(entry.path), rel_dir + entry.name, file_type
+            
+            # Visit subdirectories in name order
+            stack.extend(reversed(subdirs))
     
-    def scan_project(self):
-        """Scan the entire project and analyze all files"""
+    def scan_project(self, jobs: int = 1, verbose: bool = False, async_io: bool = False):
+        """Scan the entire project and analyze all files, parsing in `jobs` processes
+
+        With `async_io`, files are read concurrently in batches ahead of parsing.
+        """
         print("🔍 Scanning project files...")
         
-        # Define file patterns
-        patterns = {
-            'python': ['**/*.py'],
-            'javascript': ['**/*.js', '**/*.jsx'],
-            'json': ['**/*.json'],
-            'yaml': ['**/*.yml', '**/*.yaml']
-        }
-        
-        # Exclude patterns
-        exclude_dirs = {'node_modules', '__pycache__', '.git', 'build', 'dist', '.pytest_cache'}
-        
         stats = {
             'total_files': 0,
             'total_lines': 0,
-            'by_type': {},
-            'by_category': {}
+            'by_type': defaultdict(int),
+            'by_category': defaultdict(int)
         }
         
-        for file_type, pattern_list in patterns.items():
-            for pattern in pattern_list:
-                for filepath in self.project_root.glob(pattern):
-                    # Skip excluded directories
-                    if any(excluded in filepath.parts for excluded in exclude_dirs):
-                        continue
-                    
-                    print(f"  Analyzing: {filepath.relative_to(self.project_root)}")
-                    
-                    # Analyze based on file type
-                    if file_type == 'python':
-                        file_data = self.analyze_python_file(filepath)
-                    elif file_type == 'javascript':
-                        file_data = self.analyze_javascript_file(filepath)
-                    elif file_type == 'json':
-                        file_data = self.analyze_json_file(filepath)
-                    else:
-                        continue
-                    
-                    # Categorize file
-                    rel_path = filepath.relative_to(self.project_root)
-                    category = self._categorize_file(rel_path)
-                    
-                    if category not in self.documentation:
-                        self.documentation[category] = {}
-                    
-                    self.documentation[category][str(rel_path)] = file_data
-                    
-                    # Update statistics
-                    stats['total_files'] += 1
-                    if 'lines' in file_data:
-                        stats['total_lines'] += file_data['lines']
-                    
-                    stats['by_type'][file_type] = stats['by_type'].get(file_type, 0) + 1
-                    stats['by_category'][category] = stats['by_category'].get(category, 0) + 1
+        tasks = [
+            (str(self.project_root), filepath, rel_path, file_type, None)
+            for filepath, rel_path, file_type in self._iter_source_files()
+        ]
+        
+        # Reuse the analysis of files unchanged since the last run
+        keys = [self._cache_key(filepath, rel_path) for _, filepath, rel_path, _, _ in tasks]
+        results = [None] * len(tasks)
+        misses = []
+        for i, (task, key) in enumerate(zip(tasks, keys)):
+            cached = self.cache.get(key)
+            if cached is not None:
+                results[i] = (task[2], task[3], cached)
+            else:
+                misses.append(i)
+        
+        # Parsing is CPU-bound, so it is spread over processes; results come
+        # back in walk order and are merged here
+        miss_tasks = [tasks[i] for i in misses]
+        if async_io:
+            # The pool feeds tasks from its own thread, so the next batch is
+            # read while workers parse the previous one
+            miss_tasks = _prefetch(miss_tasks)
+        if jobs > 1 and len(misses) > 1:
+            with multiprocessing.Pool(jobs) as pool:
+                analyzed = pool.imap(_analyze_one, miss_tasks, chunksize=ANALYZE_CHUNKSIZE)
+                analyzed = list(self._report_progress(analyzed, len(misses), verbose))
+        else:
+            analyzed = list(self._report_progress(map(_analyze_one, miss_tasks), len(misses), verbose))
+        for i, result in zip(misses, analyzed):
+            results[i] = result
+        
+        self._merge_results(results, stats)
+        
+        if self.use_cache:
+            self.cache = {
+                key: file_data
+                for key, (_, _, file_data) in zip(keys, results)
+                if file_data is not None
+            }
+            self._save_cache()
+            print(f"♻️  Reused cached analysis for {len(tasks) - len(misses)} unchanged files")
         
+        stats['by_type'] = dict(stats['by_type'])
+        stats['by_category'] = dict(stats['by_category'])
         self.documentation['statistics'] = stats
         print(f"\n✅ Analyzed {stats['total_files']} files ({stats['total_lines']:,} lines)")
     
-    def _categorize_file(self, filepath: Path) -> str:
-        """Categorize file based on path"""
-        parts = filepath.parts
+    def _cache_key(self, filepath: Path, rel_path: str) -> str:
+        """Cache key that changes whenever the file is modified"""
+        st = filepath.stat()
+        return f"{rel_path}:{st.st_mtime_ns}:{st.st_size}"
+    
+    def _load_cache(self) -> Dict[str, Any]:
+        """Load the previous run's analysis, ignoring a missing, stale or corrupt cache"""
+        try:
+            with open(self.project_root / CACHE_FILE, 'rb') as f:
+                data = f.read()
+            cache = json_loads(data)
+        except (OSError, ValueError):
+            return {}
+        if not isinstance(cache, dict) or cache.get("analyzer") != ANALYZER_SIGNATURE:
+            return {}
+        return cache.get("files", {})
+    
+    def _save_cache(self):
+        """Atomically replace the analysis cache with this run's results"""
+        cache = {"analyzer": ANALYZER_SIGNATURE, "files": self.cache}
+        data = orjson.dumps(cache) if orjson else json.dumps(cache).encode('utf-8')
+        
+        cache_path = self.project_root / CACHE_FILE
+        tmp_path = cache_path.with_name(cache_path.name + '.tmp')
+        try:
+            with open(tmp_path, 'wb') as f:
+                f.write(data)
+            os.replace(tmp_path, cache_path)
+        except OSError as e:
+            print(f"⚠️  Could not save analysis cache: {e}")
+    
+    def _report_progress(self, results, total: int, verbose: bool):
+        """Pass analysis results through, naming each file when verbose or showing overall progress"""
+        bar = tqdm(total=total, unit="file") if tqdm is not None and not verbose else None
+        for count, result in enumerate(results, 1):
+            if verbose:
+                print(f"  Analyzing: {result[0]}")
+            elif bar is not None:
+                bar.update(1)
+            elif count % PROGRESS_INTERVAL == 0 or count == total:
+                print(f"  Analyzed {count}/{total} files")
+            yield result
+        if bar is not None:
+            bar.close()
+    
+    def _merge_results(self, results, stats: Dict[str, Any]):
+        """Store analyzed files in their categories and update statistics"""
+        sections = defaultdict(dict)
+        for rel_path, file_type, file_data in results:
+            if file_data is None:
+                continue
+            
+            # Categorize file
+            category = self._categorize_file(rel_path)
+            
+            sections[category][rel_path] = file_data
+            
+            # Update statistics
+            stats['total_files'] += 1
+            if 'lines' in file_data:
+                stats['total_lines'] += file_data['lines']
+            
+            stats['by_type'][file_type] += 1
+            stats['by_category'][category] += 1
+        
+        for category, files in sections.items():
+            self.documentation.setdefault(category, {}).update(files)
+    
+    def _categorize_file(self, rel_path: str) -> str:
+        """Categorize file based on its '/'-separated path relative to the root"""
+        parts = rel_path.split('/')
         
         if 'backend-api' in parts:
             if 'tests' in parts:
@@ -341,118 +723,116 @@ class CodeAnalyzer:
     
     def generate_markdown_documentation(self) -> str:
         """Generate comprehensive markdown documentation"""
-        md = []
-        
+        return '\n'.join(self._emit_markdown())
+    
+    def _emit_markdown(self) -> Iterator[str]:
+        """Yield the markdown documentation line by line"""
         # Title and metadata
-        md.append(f"# {self.documentation['project_name']} - Complete Code Documentation\n")
-        md.append(f"**Version:** {self.documentation['version']}  ")
-        md.append(f"**Generated:** {self.documentation['generation_date']}  ")
-        md.append(f"**Total Files:** {self.documentation['statistics']['total_files']}  ")
-        md.append(f"**Total Lines:** {self.documentation['statistics']['total_lines']:,}\n")
+        yield f"# {self.documentation['project_name']} - Complete Code Documentation\n"
+        yield f"**Version:** {self.documentation['version']}  "
+        yield f"**Generated:** {self.documentation['generation_date']}  "
+        yield f"**Total Files:** {self.documentation['statistics']['total_files']}  "
+        yield f"**Total Lines:** {self.documentation['statistics']['total_lines']:,}\n"
         
         # Table of contents
-        md.append("## 📑 Table of Contents\n")
-        md.append("1. [Project Overview](#project-overview)")
-        md.append("2. [Statistics](#statistics)")
-        md.append("3. [Backend API](#backend-api)")
-        md.append("4. [Mobile Application](#mobile-application)")
-        md.append("5. [AI/ML Models](#aiml-models)")
-        md.append("6. [IoT Device](#iot-device)")
-        md.append("7. [Tests](#tests)")
-        md.append("8. [Configuration Files](#configuration-files)\n")
+        yield "## 📑 Table of Contents\n"
+        yield "1. [Project Overview](#project-overview)"
+        yield "2. [Statistics](#statistics)"
+        yield "3. [Backend API](#backend-api)"
+        yield "4. [Mobile Application](#mobile-application)"
+        yield "5. [AI/ML Models](#aiml-models)"
+        yield "6. [IoT Device](#iot-device)"
+        yield "7. [Tests](#tests)"
+        yield "8. [Configuration Files](#configuration-files)\n"
         
         # Project overview
-        md.append("## Project Overview\n")
-        md.append("Privacy-Focused Context-Aware Digital Wellbeing System is a comprehensive solution ")
-        md.append("that combines backend API, mobile application, AI/ML models, and IoT integration ")
-        md.append("to provide intelligent notification management, focus mode, privacy protection, ")
-        md.append("and wellness monitoring.\n")
+        yield "## Project Overview\n"
+        yield "Privacy-Focused Context-Aware Digital Wellbeing System is a comprehensive solution "
+        yield "that combines backend API, mobile application, AI/ML models, and IoT integration "
+        yield "to provide intelligent notification management, focus mode, privacy protection, "
+        yield "and wellness monitoring.\n"
         
         # Statistics
-        md.append("## Statistics\n")
+        yield "## Statistics\n"
         stats = self.documentation['statistics']
-        md.append(f"- **Total Files Analyzed:** {stats['total_files']}")
-        md.append(f"- **Total Lines of Code:** {stats['total_lines']:,}")
-        md.append("\n### Files by Type\n")
+        yield f"- **Total Files Analyzed:** {stats['total_files']}"
+        yield f"- **Total Lines of Code:** {stats['total_lines']:,}"
+        yield "\n### Files by Type\n"
         for file_type, count in stats['by_type'].items():
-            md.append(f"- **{file_type.capitalize()}:** {count} files")
-        md.append("\n### Files by Category\n")
+            yield f"- **{file_type.capitalize()}:** {count} files"
+        yield "\n### Files by Category\n"
         for category, count in stats['by_category'].items():
-            md.append(f"- **{category.replace('_', ' ').title()}:** {count} files")
-        md.append("")
+            yield f"- **{category.replace('_', ' ').title()}:** {count} files"
+        yield ""
         
         # Backend API documentation
-        md.append("## Backend API\n")
-        md.append("The backend API is built with FastAPI and provides RESTful endpoints for all system functionality.\n")
+        yield "## Backend API\n"
+        yield "The backend API is built with FastAPI and provides RESTful endpoints for all system functionality.\n"
         
         if 'backend' in self.documentation:
             backend_files = self.documentation['backend']
             
             # Group files by subdirectory
-            api_files = {k: v for k, v in backend_files.items() if '/api/' in k}
-            service_files = {k: v for k, v in backend_files.items() if '/services/' in k}
-            core_files = {k: v for k, v in backend_files.items() if '/core/' in k}
+            groups = self._group_files(backend_files, ('/api/', '/services/', '/core/'))
             
-            if api_files:
-                md.append("### API Endpoints\n")
-                for filepath, data in sorted(api_files.items()):
-                    md.extend(self._document_python_file(filepath, data))
+            if groups['/api/']:
+                yield "### API Endpoints\n"
+                for filepath, data in groups['/api/']:
+                    yield from self._document_python_file(filepath, data)
             
-            if service_files:
-                md.append("### Services\n")
-                for filepath, data in sorted(service_files.items()):
-                    md.extend(self._document_python_file(filepath, data))
+            if groups['/services/']:
+                yield "### Services\n"
+                for filepath, data in groups['/services/']:
+                    yield from self._document_python_file(filepath, data)
             
-            if core_files:
-                md.append("### Core Modules\n")
-                for filepath, data in sorted(core_files.items()):
-                    md.extend(self._document_python_file(filepath, data))
+            if groups['/core/']:
+                yield "### Core Modules\n"
+                for filepath, data in groups['/core/']:
+                    yield from self._document_python_file(filepath, data)
         
         # Mobile application documentation
-        md.append("## Mobile Application\n")
-        md.append("React Native mobile application for Android with offline-first architecture.\n")
+        yield "## Mobile Application\n"
+        yield "React Native mobile application for Android with offline-first architecture.\n"
         
         if 'mobile' in self.documentation:
             mobile_files = self.documentation['mobile']
             
-            screen_files = {k: v for k, v in mobile_files.items() if '/screens/' in k}
-            service_files = {k: v for k, v in mobile_files.items() if '/services/' in k}
-            component_files = {k: v for k, v in mobile_files.items() if '/components/' in k}
+            groups = self._group_files(mobile_files, ('/screens/', '/components/', '/services/'))
             
-            if screen_files:
-                md.append("### Screens\n")
-                for filepath, data in sorted(screen_files.items()):
-                    md.extend(self._document_javascript_file(filepath, data))
+            if groups['/screens/']:
+                yield "### Screens\n"
+                for filepath, data in groups['/screens/']:
+                    yield from self._document_javascript_file(filepath, data)
             
-            if component_files:
-                md.append("### Components\n")
-                for filepath, data in sorted(component_files.items()):
-                    md.extend(self._document_javascript_file(filepath, data))
+            if groups['/components/']:
+                yield "### Components\n"
+                for filepath, data in groups['/components/']:
+                    yield from self._document_javascript_file(filepath, data)
             
-            if service_files:
-                md.append("### Services\n")
-                for filepath, data in sorted(service_files.items()):
-                    md.extend(self._document_javascript_file(filepath, data))
+            if groups['/services/']:
+                yield "### Services\n"
+                for filepath, data in groups['/services/']:
+                    yield from self._document_javascript_file(filepath, data)
         
         # AI/ML models documentation
-        md.append("## AI/ML Models\n")
-        md.append("TensorFlow-based machine learning models for intelligent classification and prediction.\n")
+        yield "## AI/ML Models\n"
+        yield "TensorFlow-based machine learning models for intelligent classification and prediction.\n"
         
         if 'ai_models' in self.documentation:
             for filepath, data in sorted(self.documentation['ai_models'].items()):
-                md.extend(self._document_python_file(filepath, data))
+                yield from self._document_python_file(filepath, data)
         
         # IoT device documentation
-        md.append("## IoT Device\n")
-        md.append("Raspberry Pi-based IoT device with environmental sensors.\n")
+        yield "## IoT Device\n"
+        yield "Raspberry Pi-based IoT device with environmental sensors.\n"
         
         if 'iot' in self.documentation:
             for filepath, data in sorted(self.documentation['iot'].items()):
-                md.extend(self._document_python_file(filepath, data))
+                yield from self._document_python_file(filepath, data)
         
         # Tests documentation
-        md.append("## Tests\n")
-        md.append("Comprehensive test suite covering backend, mobile, and AI components.\n")
+        yield "## Tests\n"
+        yield "Comprehensive test suite covering backend, mobile, and AI components.\n"
         
         test_count = 0
         if 'backend_tests' in self.documentation:
@@ -460,104 +840,131 @@ class CodeAnalyzer:
         if 'mobile_tests' in self.documentation:
             test_count += len(self.documentation['mobile_tests'])
         
-        md.append(f"**Total Test Files:** {test_count}\n")
+        yield f"**Total Test Files:** {test_count}\n"
         
         # Configuration files
-        md.append("## Configuration Files\n")
+        yield "## Configuration Files\n"
         if 'configs' in self.documentation:
             for filepath, data in sorted(self.documentation['configs'].items()):
-                md.append(f"### {filepath}\n")
+                yield f"### {filepath}\n"
                 if 'keys' in data:
-                    md.append(f"**Configuration Keys:** {', '.join(data['keys'][:10])}\n")
-        
-        return '\n'.join(md)
+                    yield f"**Configuration Keys:** {', '.join(data['keys'][:10])}\n"
+    
+    def _group_files(self, files: Dict[str, Any], markers: Tuple[str, ...]) -> Dict[str, List[Tuple[str, Any]]]:
+        """Split files by the first path marker they contain in one pass, each group sorted by path"""
+        groups = {marker: [] for marker in markers}
+        for filepath in sorted(files):
+            for marker in markers:
+                if marker in filepath:
+                    groups[marker].append((filepath, files[filepath]))
+                    break
+        return groups
     
     def _document_python_file(self, filepath: str, data: Dict[str, Any]) -> List[str]:
-        """Generate documentation for a Python file"""
-        lines = []
-        
-        lines.append(f"#### {filepath}\n")
-        lines.append(f"**Lines:** {data.get('lines', 'N/A')}  ")
-        lines.append(f"**Type:** Python Module\n")
-        
-        if data.get('docstring'):
-            lines.append(f"**Description:** {data['docstring'][:200]}...\n")
+        """Generate documentation for a Python file as a single markdown chunk"""
+        # Each piece starts with the newline that separates it from the previous line
+        docstring = data.get('docstring')
+        description_md = f"\n**Description:** {docstring[:200]}...\n" if docstring else ""
         
         # Document classes
+        classes_md = ""
         if data.get('classes'):
-            lines.append("**Classes:**\n")
-            for cls in data['classes']:
-                lines.append(f"- `{cls['name']}` (line {cls['lineno']})")
-                if cls.get('docstring'):
-                    lines.append(f"  - {cls['docstring'][:100]}")
-                if cls.get('methods'):
-                    lines.append(f"  - Methods: {len(cls['methods'])}")
-                    for method in cls['methods'][:5]:  # Show first 5 methods
-                        params = ', '.join([p['name'] for p in method.get('parameters', [])])
-                        lines.append(f"    - `{method['name']}({params})`")
+            classes_md = "\n**Classes:**\n" + "".join(
+                self._document_python_class(cls) for cls in data['classes']
+            )
         
         # Document functions
+        functions_md = ""
         if data.get('functions'):
-            lines.append("**Functions:**\n")
-            for func in data['functions'][:10]:  # Show first 10 functions
-                params = ', '.join([p['name'] for p in func.get('parameters', [])])
-                lines.append(f"- `{func['name']}({params})` (line {func['lineno']})")
-                if func.get('docstring'):
-                    lines.append(f"  - {func['docstring'][:100]}")
+            functions_md = "\n**Functions:**\n" + "".join(
+                f"\n- `{func['name']}({_param_names(func)})` (line {func['lineno']})"
+                + (f"\n  - {func['docstring'][:100]}" if func.get('docstring') else "")
+                for func in data['functions'][:10]  # Show first 10 functions
+            )
         
         # Document imports
-        if data.get('imports') and len(data['imports']) > 0:
-            lines.append(f"**Key Imports:** {len(data['imports'])} modules\n")
+        imports_md = f"\n**Key Imports:** {len(data['imports'])} modules\n" if data.get('imports') else ""
         
-        lines.append("")
-        return lines
+        return [
+            f"#### {filepath}\n\n**Lines:** {data.get('lines', 'N/A')}  \n**Type:** Python Module\n"
+            f"{description_md}{classes_md}{functions_md}{imports_md}\n"
+        ]
+    
+    def _document_python_class(self, cls: Dict[str, Any]) -> str:
+        """Generate the markdown list entry for a Python class"""
+        docstring_md = f"\n  - {cls['docstring'][:100]}" if cls.get('docstring') else ""
+        methods_md = ""
+        if cls.get('methods'):
+            methods_md = f"\n  - Methods: {len(cls['methods'])}" + "".join(
+                f"\n    - `{method['name']}({_param_names(method)})`"
+                for method in cls['methods'][:5]  # Show first 5 methods
+            )
+        return f"\n- `{cls['name']}` (line {cls['lineno']}){docstring_md}{methods_md}"
     
     def _document_javascript_file(self, filepath: str, data: Dict[str, Any]) -> List[str]:
-        """Generate documentation for a JavaScript file"""
-        lines = []
-        
-        lines.append(f"#### {filepath}\n")
-        lines.append(f"**Lines:** {data.get('lines', 'N/A')}  ")
-        lines.append(f"**Type:** JavaScript/React\n")
-        
+        """Generate documentation for a JavaScript file as a single markdown chunk"""
         # Document React components
+        components_md = ""
         if data.get('components'):
-            lines.append("**React Components:**\n")
-            for comp in data['components']:
-                lines.append(f"- `{comp['name']}` - Props: {comp.get('props', 'none')}")
+            components_md = "\n**React Components:**\n" + "".join(
+                f"\n- `{comp['name']}` - Props: {comp.get('props', 'none')}"
+                for comp in data['components']
+            )
         
         # Document hooks
+        hooks_md = ""
         if data.get('hooks'):
-            lines.append("**React Hooks:**\n")
-            for hook in data['hooks'][:10]:
-                if hook['type'] == 'useState':
-                    lines.append(f"- useState: `{hook['state']}`")
-                elif hook['type'] == 'useEffect':
-                    lines.append(f"- useEffect: {hook['count']} effects")
+            hooks_md = "\n**React Hooks:**\n" + "".join(
+                f"\n- useState: `{hook['state']}`" if hook['type'] == 'useState'
+                else f"\n- useEffect: {hook['count']} effects" if hook['type'] == 'useEffect'
+                else ""
+                for hook in data['hooks'][:10]
+            )
         
         # Document imports
-        if data.get('imports') and len(data['imports']) > 0:
-            lines.append(f"**Imports:** {len(data['imports'])} modules\n")
+        imports_md = f"\n**Imports:** {len(data['imports'])} modules\n" if data.get('imports') else ""
         
-        lines.append("")
-        return lines
-    
+        return [
+            f"#### {filepath}\n\n**Lines:** {data.get('lines', 'N/A')}  \n**Type:** JavaScript/React\n"
+            f"{components_md}{hooks_md}{imports_md}\n"
+        ]
+
     def save_documentation(self, output_file: str):
-        """Save documentation to file"""
-        markdown_doc = self.generate_markdown_documentation()
-        
+        """Save documentation to file, streaming it line by line"""
         output_path = self.project_root / output_file
-        with open(output_path, 'w', encoding='utf-8') as f:
-            f.write(markdown_doc)
+        size = 0
+        with open(output_path, 'w', encoding='utf-8', buffering=1 << 20) as f:
+            for line in self._emit_markdown():
+                f.write(line + '\n')
+                size += len(line) + 1
         
         print(f"\n📄 Documentation saved to: {output_path}")
-        print(f"📊 Documentation size: {len(markdown_doc):,} characters")
+        print(f"📊 Documentation size: {size:,} characters")
         
         return output_path
 
 
 def main():
     """Main execution function"""
+    parser = argparse.ArgumentParser(description="Generate complete code documentation")
+    parser.add_argument(
+        '--jobs', type=int, default=max(1, (os.cpu_count() or 2) - 1),
+        help="number of processes used to parse files (default: CPU count - 1)"
+    )
+    parser.add_argument(
+        '--no-cache', action='store_true',
+        help=f"re-analyze every file instead of reusing {CACHE_FILE}"
+    )
+    parser.add_argument(
+        '--verbose', action='store_true',
+        help="print every file as it is analyzed instead of a progress summary"
+    )
+    parser.add_argument(
+        '--async-io', action='store_true',
+        help="read files concurrently ahead of parsing, for slow or network file systems"
+    )
+    args = parser.parse_args()
+    
     print("=" * 70)
     print("  COMPREHENSIVE PROJECT DOCUMENTATION GENERATOR")
     print("  Privacy-Focused Context-Aware Digital Wellbeing System")
@@ -572,10 +979,10 @@ def main():
     print()
     
     # Create analyzer
-    analyzer = CodeAnalyzer(str(project_root))
+    analyzer = CodeAnalyzer(str(project_root), use_cache=not args.no_cache)
     
     # Scan project
-    analyzer.scan_project()
+    analyzer.scan_project(jobs=args.jobs, verbose=args.verbose, async_io=args.async_io)
     
     # Generate documentation
     print("\n📝 Generating comprehensive documentation...")